@@ -0,0 +1,285 @@
+# analysis_server.py
+# Local HTTP server for on-demand metrics and heatmaps.
+#
+# Stdlib only (plus whatever the analysis imports). Requests are handled on
+# threads; the analysis itself runs in a process pool so several queries
+# can use several cores. Generated rows and finished results are kept in
+# bounded in-memory LRU caches, and identical queries that arrive while one
+# is being computed wait for that one instead of starting their own.
+#
+#   python analysis_server.py --port 8765
+#
+#   GET  /metrics?pn=x16x16x16,12&stage=6&pair=5,6
+#   GET  /rank?pn=x16x16x16,12&stage=6&top=5&wraparounds=1
+#   GET  /heatmap?pn=...&stage=8&title=Bristol
+#   POST /rank   {"rows": ["123456", "214365", ...], "exclude": [1]}
+#   GET  /stats
+#
+# Rows are given either as pn + stage (the plain course) or as rows
+# (a JSON list, or a comma/whitespace separated string).
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+
+class LRUCache:
+    """Thread-safe, size-bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+# ---------- work done in the pool ----------
+
+def _compute(kind, rows, params):
+    """Runs in a worker process; returns (content_type, body bytes)."""
+    import tenors_dist_chart as tdc
+
+    wrap = params["wraparounds"]
+    if kind == "metrics":
+        result = tdc.tenor_metrics(rows, params["pair"], include_wraparounds=wrap)
+    elif kind == "rank":
+        result = tdc.rank_all_pairs(rows, exclude=set(params["exclude"]), include_wraparounds=wrap)
+        if params["top"]:
+            result = result[:params["top"]]
+    elif kind == "heatmap":
+        html = tdc.distance_heatmap_html(rows, params["title"], exclude=set(params["exclude"]),
+                                         include_wraparounds=wrap)
+        return "text/html; charset=utf-8", html.encode("utf-8")
+    else:
+        raise ValueError(f"unknown query {kind!r}")
+    return "application/json", json.dumps(result).encode("utf-8")
+
+
+# ---------- request parsing ----------
+
+def _flag(v):
+    return str(v).lower() in ("1", "true", "yes", "on")
+
+
+def _bell(b):
+    from place_notation import symbol_to_bell
+    return b if isinstance(b, int) and not isinstance(b, bool) else symbol_to_bell(str(b).strip())
+
+
+def _bells(v, default):
+    """Bells as ints or symbols ("9,0,E" or [9, "0", "E"])."""
+    if v is None:
+        return default
+    if isinstance(v, (list, tuple)):
+        return tuple(_bell(b) for b in v)
+    return tuple(_bell(b) for b in str(v).split(",") if b.strip())
+
+
+def parse_params(q, stage):
+    """Query parameters for rows of `stage`; pair defaults to the back two bells."""
+    pair = _bells(q.get("pair"), (stage - 1, stage))
+    if len(pair) != 2:
+        raise ValueError("pair must be two bells, e.g. 7,8")
+    for bell in pair:
+        if not 1 <= bell <= stage:
+            raise ValueError(f"bell {bell} is not in a stage {stage} row")
+    return {
+        "wraparounds": _flag(q.get("wraparounds", False)),
+        "pair": pair,
+        "exclude": _bells(q.get("exclude"), (1,)),
+        "top": int(q.get("top", 0) or 0),
+        "title": str(q.get("title", "no-title")),
+    }
+
+
+class AnalysisService:
+    """Row generation, caching and dispatch to the process pool."""
+
+    def __init__(self, workers=None, cache_size=256, rows_cache_size=64):
+        # spawn, not fork: workers are started lazily from request threads,
+        # and forking a threaded process can copy held locks into the child
+        self.pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        self.rows_cache = LRUCache(rows_cache_size)
+        self.results = LRUCache(cache_size)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def rows_for(self, q):
+        """(rows_key, rows) for a query's pn+stage or rows payload."""
+        if q.get("pn") is not None:
+            if q.get("stage") is None:
+                raise ValueError("pn needs stage")
+            key = ("pn", str(q["pn"]), int(q["stage"]))
+            rows = self.rows_cache.get(key)
+            if rows is None:
+                from place_notation import course_rows
+                rows = tuple(course_rows(key[1], key[2]))
+                self.rows_cache.put(key, rows)
+            return key, rows
+
+        raw = q.get("rows")
+        if raw is None:
+            raise ValueError("give pn and stage, or rows")
+        rows = tuple(raw) if isinstance(raw, list) else tuple(str(raw).replace(",", " ").split())
+        if not all(isinstance(r, str) for r in rows):
+            raise ValueError("rows must be a list of strings, e.g. [\"123456\", \"214365\"]")
+        if not rows:
+            raise ValueError("no rows given")
+        if len({len(r) for r in rows}) != 1:
+            raise ValueError("rows must all be the same length")
+        digest = hashlib.blake2b("\n".join(rows).encode("utf-8"), digest_size=16).hexdigest()
+        return ("rows", digest), rows
+
+    def query(self, kind, q):
+        rows_key, rows = self.rows_for(q)
+        params = parse_params(q, len(rows[0]))
+        key = (kind, rows_key, tuple(sorted(params.items())))
+
+        # the cache and the in-flight table are checked under one lock, and
+        # the owner fills the cache before leaving the table, so an identical
+        # query always finds one or the other
+        with self._lock:
+            hit = self.results.get(key)
+            if hit is not None:
+                return hit
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = self.pool.submit(_compute, kind, list(rows), params)
+                self._inflight[key] = fut
+        try:
+            result = fut.result()
+        finally:
+            if owner:
+                with self._lock:
+                    if fut.done() and not fut.cancelled() and fut.exception() is None:
+                        self.results.put(key, fut.result())
+                    self._inflight.pop(key, None)
+        return result
+
+    def stats(self):
+        return {"rows_cache": self.rows_cache.stats(), "results": self.results.stats(),
+                "inflight": len(self._inflight)}
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None   # set by serve()
+    server_version = "TinyTowerAnalysis/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self._dispatch(url.path, q)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            return self._error(400, "bad Content-Length")
+        if length < 0:
+            return self._error(400, "bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            return self._send(413, "application/json", b'{"error": "payload too large"}')
+        try:
+            q = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(q, dict):
+                raise ValueError("body must be a JSON object")
+        except ValueError as e:
+            return self._error(400, e)
+        q.update({k: v[-1] for k, v in parse_qs(url.query).items()})
+        self._dispatch(url.path, q)
+
+    def _dispatch(self, path, q):
+        kind = path.strip("/")
+        if kind == "stats":
+            return self._send(200, "application/json", json.dumps(self.service.stats()).encode("utf-8"))
+        if kind not in ("metrics", "rank", "heatmap"):
+            return self._error(404, f"no such endpoint: {path}")
+        try:
+            content_type, body = self.service.query(kind, q)
+        except (ValueError, KeyError) as e:
+            return self._error(400, e)
+        except Exception as e:   # a worker crash (BrokenProcessPool) or a bug in the analysis
+            return self._error(500, f"{type(e).__name__}: {e}")
+        self._send(200, content_type, body)
+
+    def _error(self, status, err):
+        self._send(status, "application/json", json.dumps({"error": str(err)}).encode("utf-8"))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        if os.environ.get("TINY_TOWER_SERVER_LOG"):
+            super().log_message(fmt, *args)
+
+
+def serve(host="127.0.0.1", port=8765, workers=None, cache_size=256):
+    service = AnalysisService(workers=workers, cache_size=cache_size)
+    handler = type("BoundHandler", (Handler,), {"service": service})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    print(f"Serving on http://{host}:{httpd.server_port}/")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local analysis server for metrics and heatmaps.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache-size", type=int, default=256, help="results kept in memory")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers, args.cache_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# audio_render.py
+# Offline rendering of rows to a WAV file, sounding like the web app.
+#
+# Uses the same voice as audioEngine.js: BELL_FREQS up a fifth, a short
+# linear attack then an exponential decay to 0.0001 over the strike length,
+# and the same timing as playAllRows in main.js: one beat between blows in
+# a row, plus a handstroke gap (one extra beat by default) after rounds and
+# every other row. Bells map to the deepest notes of the 12-note scale, and
+# odd stages get a cover bell, as in rowToPlaces.
+#
+# Each bell's note is synthesised once as a NumPy array; the touch is then
+# mixed by adding those into a fixed-size block buffer that is flushed to
+# the WAV file as it fills, so memory stays bounded however long the touch.
+#
+#   python audio_render.py --pn x58x14.58x58.36.14x14.58x14x18,18 --stage 8 -o bristol.wav
+#   python audio_render.py --rows touch.txt --stage 8 --bpm 240 -o touch.wav
+#
+# Requires numpy.
+
+import argparse
+import wave
+
+import numpy as np
+
+from permutation import rows_array
+
+# Index: 1 = highest ... 12 = lowest (tonic), as in audioEngine.js
+BELL_FREQS = np.array([
+    392.00, 349.23, 329.63, 293.66, 261.63, 246.94,
+    220.00, 196.00, 174.61, 164.81, 146.83, 130.81,
+])
+MAX_PLACE = len(BELL_FREQS)
+
+DEFAULT_BPM = 275          # defaults.js
+RELEASE_PAD = 0.01         # oscillators stop this long after the decay ends
+# Fixed mix level, so loudness doesn't change with bpm or strike. The tails
+# of earlier notes add at most a geometric series to each new one; at the
+# slowest decay allowed (3s strike at 300 bpm) that is about 2.2 x a single
+# note, so at volume <= 0.9 this doesn't clip.
+MIX_HEADROOM = 0.5
+
+
+def rows_to_places(rows, stage):
+    """
+    (n_rows, blows) int array of global notes 1..12 for each blow, with the
+    cover appended on odd stages (rowToPlaces in main.js).
+    """
+    if stage > MAX_PLACE:
+        raise ValueError(f"audio supports stages up to {MAX_PLACE}, got {stage}")
+    if len(rows[0]) != stage:
+        raise ValueError(f"rows are {len(rows[0])} bells but stage is {stage}")
+    local = rows_array(rows).astype(np.int16)
+
+    effective = stage if stage % 2 == 0 else stage + 1
+    places = local + (MAX_PLACE - effective)
+    if stage % 2 == 1:
+        cover = np.full((len(rows), 1), MAX_PLACE, dtype=places.dtype)
+        places = np.concatenate([places, cover], axis=1)
+    return places
+
+
+def blow_times(n_rows, blows, beat, handstroke_gap=1.0):
+    """
+    Start time (seconds) of every blow, shape (n_rows, blows). Rows follow on
+    one beat after the last blow, plus handstroke_gap beats after even rows
+    (rounds is row 0, so the gap comes after it, then every other row).
+    """
+    i = np.arange(n_rows)
+    even_rows_before = (i + 1) // 2
+    row_start = (i * blows + even_rows_before * handstroke_gap) * beat
+    return row_start[:, None] + np.arange(blows)[None, :] * beat
+
+
+def note_templates(strike, sample_rate, partials=((1.0, 1.0),), freqs=BELL_FREQS):
+    """
+    One rendered note per global place, shape (len(freqs), samples): sum of
+    the partials (freq ratio, amplitude) at 1.5 x freqs under the
+    audioEngine envelope, scaled so the amplitudes add up to 1.
+    """
+    dur = max(0.05, min(3.0, strike))
+    n = int(round((dur + RELEASE_PAD) * sample_rate))
+    t = np.arange(n) / sample_rate
+
+    attack = min(0.005, dur * 0.1)
+    env = np.empty(n)
+    rising = t < attack
+    env[rising] = 0.0001 + (1.0 - 0.0001) * t[rising] / attack
+    decay_t = np.clip((t[~rising] - attack) / (dur - attack), 0.0, 1.0)
+    env[~rising] = 0.0001 ** decay_t
+
+    freqs = 1.5 * np.asarray(freqs, dtype=float)
+    tones = np.zeros((len(freqs), n))
+    for ratio, amp in partials:
+        tones += amp * np.sin(2 * np.pi * (ratio * freqs)[:, None] * t[None, :])
+    tones /= max(1e-9, sum(abs(amp) for _, amp in partials))
+    return (tones * env[None, :]).astype(np.float32)
+
+
+def render_wav(rows, filename, stage=None, bpm=DEFAULT_BPM, strike=1.0, volume=0.9,
+               handstroke_gap=1.0, sample_rate=44100, partials=((1.0, 1.0),),
+               freqs=BELL_FREQS, block_seconds=5.0):
+    """
+    Render rows (strings) to a 16-bit mono WAV file. Returns the duration
+    in seconds.
+
+    freqs are the notes of the 12 global places, highest first (see
+    rows_to_places). Each note peaks at volume * MIX_HEADROOM whatever the
+    bpm or strike, so renders at different speeds are equally loud.
+    """
+    if len(freqs) != MAX_PLACE:
+        raise ValueError(f"freqs needs {MAX_PLACE} notes, got {len(freqs)}")
+    if not rows:
+        raise ValueError("rows must be a non-empty list of rows.")
+    stage = stage or len(rows[0])
+    beat = 60.0 / max(30, min(300, bpm))
+
+    places = rows_to_places(rows, stage)
+    n_rows, blows = places.shape
+    starts = np.rint(blow_times(n_rows, blows, beat, handstroke_gap) * sample_rate).astype(np.int64).ravel()
+    notes = places.ravel() - 1
+
+    templates = note_templates(strike, sample_rate, partials, freqs)
+    tlen = templates.shape[1]
+    gain = volume * MIX_HEADROOM
+
+    block = max(int(block_seconds * sample_rate), tlen)
+    buf = np.zeros(block + tlen, dtype=np.float32)
+    buf_start = 0
+    total = int(starts[-1]) + tlen
+
+    with wave.open(filename, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+
+        def flush(n):
+            pcm = np.clip(buf[:n] * gain, -1.0, 1.0)
+            w.writeframes((pcm * 32767).astype("<i2").tobytes())
+            buf[:-n] = buf[n:]
+            buf[-n:] = 0.0
+
+        # notes are in time order; each block's notes go in together, then
+        # the finished part of the buffer is written out
+        block_ends = np.searchsorted(starts, np.arange(block, total + block, block))
+        first = 0
+        for end in block_ends:
+            for s, note in zip(starts[first:end] - buf_start, notes[first:end]):
+                buf[s:s + tlen] += templates[note]
+            first = end
+            n = min(block, total - buf_start)
+            if n <= 0:
+                break
+            flush(n)
+            buf_start += n
+
+    return total / sample_rate
+
+
+def render_pn_wav(pn, stage, filename, max_changes=6000, **kwargs):
+    """Render the plain course of a method (including the closing rounds)."""
+    from place_notation import generate_rows
+    return render_wav(generate_rows(pn, stage, max_changes=max_changes), filename, stage, **kwargs)
+
+
+def main(argv=None):
+    from tenors_cli import read_rows
+
+    parser = argparse.ArgumentParser(description="Render rows or a method's plain course to WAV.")
+    parser.add_argument("--rows", metavar="FILE", help="file of rows, one per line ('-': stdin)")
+    parser.add_argument("--pn", help="place notation; renders the plain course")
+    parser.add_argument("--stage", type=int)
+    parser.add_argument("--max-changes", type=int, default=6000)
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--bpm", type=float, default=DEFAULT_BPM)
+    parser.add_argument("--strike", type=float, default=1.0, help="note length, seconds")
+    parser.add_argument("--volume", type=float, default=0.9)
+    parser.add_argument("--handstroke-gap", type=float, default=1.0, help="extra beats before handstrokes")
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    args = parser.parse_args(argv)
+
+    opts = dict(bpm=args.bpm, strike=args.strike, volume=args.volume,
+                handstroke_gap=args.handstroke_gap, sample_rate=args.sample_rate)
+    rows = read_rows(args, closing_rounds=True)
+    secs = render_wav(rows, args.output, args.stage, **opts)
+    print(f"Wrote {args.output} ({secs:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
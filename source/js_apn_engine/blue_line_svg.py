@@ -0,0 +1,167 @@
+# blue_line_svg.py
+# Standalone blue line SVGs, without a browser.
+#
+# blueLine.js measures character positions in the rendered page, which is
+# fine for a lead or a course but far too slow for a peal. Here each bell's
+# line comes straight from the rows: x is its place, y the row number. Runs
+# of blows going the same way (hunting, or making places) are merged into a
+# single relative path segment, and the SVG is written a column at a time,
+# so a touch of thousands of changes only ever has one column in memory.
+#
+# Colours, widths and separators follow renderGeneratedList in main.js:
+# hunt bells in tomato, working bells in the following line colours, and a
+# separator under each lead head. The one exception is the separator colour:
+# the app draws #fff on its dark page, which would vanish on the white
+# background an SVG normally gets, so it is grey here (see separator_color).
+#
+#   python blue_line_svg.py --pn x58x14.58x58.36.14x14.58x14x18,18 --stage 8 -o bristol.svg
+#   python blue_line_svg.py --rows peal.txt --lead-length 32 --leads-per-column 2 -o peal.svg
+
+import argparse
+
+LINE_COLORS = ["tomato", "deepskyblue", "limegreen", "gold", "orchid", "cyan", "orange"]
+LINE_WIDTH_HUNT_BELL = 2        # defaults.js lineWidth_huntBell
+LINE_WIDTH_WORKING_BELL = 2     # defaults.js lineWidth_workingBell
+LINE_WIDTH_LEAD_SEPARATOR = 1   # defaults.js lineWidth_leadHeadSeparator
+SEPARATOR_COLOR = "#999"        # main.js uses #fff, on a dark background
+
+SVG_NS = "http://www.w3.org/2000/svg"
+
+
+def _fmt(v):
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+
+def _escape_attr(s):
+    return str(s).replace("&", "&amp;").replace('"', "&quot;").replace("<", "&lt;")
+
+
+def _escape_text(s):
+    return str(s).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def bell_path(rows, bell, x0, y0, char_width, row_height):
+    """
+    SVG path data for one bell down `rows`: an absolute move to the first
+    blow, then one relative line per run of blows moving the same way.
+    Returns "" if the bell isn't in the rows.
+    """
+    places = [r.find(bell) for r in rows]
+    if not places or min(places) < 0:
+        return ""
+
+    parts = [f"M{_fmt(x0 + (places[0] + 0.5) * char_width)} {_fmt(y0 + 0.5 * row_height)}"]
+    run_dir = None
+    run_len = 0
+    for prev, cur in zip(places, places[1:]):
+        d = cur - prev
+        if d != run_dir and run_len:
+            parts.append(f"l{_fmt(run_dir * run_len * char_width)} {_fmt(run_len * row_height)}")
+            run_len = 0
+        run_dir = d
+        run_len += 1
+    if run_len:
+        parts.append(f"l{_fmt(run_dir * run_len * char_width)} {_fmt(run_len * row_height)}")
+    return "".join(parts)
+
+
+def write_blue_line_svg(rows, filename, hunt_bells=("1",), working_bells=("2",),
+                        lead_length=None, lead_head_offset=0, rows_per_column=None,
+                        draw_digits=True, char_width=12, row_height=20, padding=8, column_gap=24,
+                        separator_color=SEPARATOR_COLOR):
+    """
+    Write a multi-column blue line SVG for `rows` (strings) to `filename`.
+
+    Each column shows rows_per_column changes (default: all rows, or one
+    lead if lead_length is given) and repeats the last row of the previous
+    column at its top so the lines join up. Lead separators are drawn under
+    every lead head, starting at lead_head_offset (or lead_length) as in
+    renderLeadSeparators; pass separator_color="#fff" for the app's look
+    on a dark background.
+    """
+    if not rows:
+        raise ValueError("rows must be a non-empty list of rows.")
+    stage = len(rows[0])
+    n_rows = len(rows)
+    per_col = rows_per_column or lead_length or n_rows
+    n_cols = max(1, -(-(n_rows - 1) // per_col)) if n_rows > 1 else 1
+
+    col_w = stage * char_width
+    width = 2 * padding + n_cols * col_w + (n_cols - 1) * column_gap
+    height = 2 * padding + (min(per_col, n_rows - 1) + 1) * row_height
+
+    lines = [(b, LINE_COLORS[0], LINE_WIDTH_HUNT_BELL) for b in hunt_bells]
+    lines += [(b, LINE_COLORS[(1 + i) % len(LINE_COLORS)], LINE_WIDTH_WORKING_BELL)
+              for i, b in enumerate(working_bells)]
+
+    first_sep = lead_head_offset or lead_length
+
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(f'<svg xmlns="{SVG_NS}" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n')
+        if draw_digits:
+            f.write(f'<style>text{{font-family:ui-monospace,Menlo,Consolas,monospace;'
+                    f'font-size:{_fmt(row_height * 0.7)}px;fill:#555;letter-spacing:0}}</style>\n')
+        f.write('<g fill="none" stroke-linejoin="round" stroke-linecap="round">\n')
+
+        for c in range(n_cols):
+            start = c * per_col
+            col_rows = rows[start:start + per_col + 1]
+            x0 = padding + c * (col_w + column_gap)
+            y0 = padding
+            f.write(f'<g data-column="{c}">\n')
+
+            if draw_digits:
+                for i, r in enumerate(col_rows):
+                    y = y0 + (i + 0.75) * row_height
+                    f.write(f'<text x="{_fmt(x0)}" y="{_fmt(y)}" textLength="{col_w}">{_escape_text(r)}</text>\n')
+
+            if lead_length:
+                for i in range(len(col_rows)):
+                    boundary = start + i   # separator under row boundary-1
+                    if boundary >= first_sep and (boundary - first_sep) % lead_length == 0 and i > 0:
+                        y = _fmt(y0 + i * row_height)
+                        f.write(f'<line x1="{_fmt(x0)}" y1="{y}" x2="{_fmt(x0 + col_w)}" y2="{y}" '
+                                f'stroke="{_escape_attr(separator_color)}" stroke-width="{LINE_WIDTH_LEAD_SEPARATOR}" '
+                                f'shape-rendering="crispEdges"/>\n')
+
+            for bell, color, w in lines:
+                d = bell_path(col_rows, bell, x0, y0, char_width, row_height)
+                if d:
+                    f.write(f'<path d="{d}" stroke="{_escape_attr(color)}" stroke-width="{w}" '
+                            f'data-bell="{_escape_attr(bell)}"/>\n')
+            f.write("</g>\n")
+
+        f.write("</g>\n</svg>\n")
+    return filename
+
+
+def main(argv=None):
+    from tenors_cli import read_rows
+
+    parser = argparse.ArgumentParser(description="Write a blue line SVG for rows or a method's plain course.")
+    parser.add_argument("--rows", metavar="FILE", help="file of rows, one per line ('-': stdin)")
+    parser.add_argument("--pn", help="place notation; draws the plain course")
+    parser.add_argument("--stage", type=int)
+    parser.add_argument("--max-changes", type=int, default=6000)
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--hunt", default="1", help="hunt bell symbols, e.g. 1 or 12")
+    parser.add_argument("--working", default="2", help="working bell symbols to draw, e.g. 28")
+    parser.add_argument("--lead-length", type=int, help="default: length of the PN's lead")
+    parser.add_argument("--leads-per-column", type=int, default=1)
+    parser.add_argument("--no-digits", action="store_true")
+    args = parser.parse_args(argv)
+
+    rows = read_rows(args, closing_rounds=True)
+    lead_length = args.lead_length
+    if args.pn is not None and not lead_length:
+        from place_notation import expand_place_notation
+        lead_length = len(expand_place_notation(args.pn))
+
+    per_col = lead_length * args.leads_per_column if lead_length else None
+    write_blue_line_svg(rows, args.output, hunt_bells=tuple(args.hunt), working_bells=tuple(args.working),
+                        lead_length=lead_length, rows_per_column=per_col, draw_digits=not args.no_digits)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# cycle_analysis.py
+# Cycle structure of every row, and coursing orders at lead heads, in bulk.
+#
+# Each row is read as a permutation of rounds the same way Perm.fromOneLine
+# does in Permutation.js (the bell starting in place i moves to wherever it
+# is in the row), so cycle lengths and periods agree with the app. All rows
+# of a touch are held as one (n_rows, stage) uint8 array and the cycle
+# lengths are found by repeatedly composing the whole array with itself —
+# stage steps of NumPy indexing, not a walk per row — so a peal's profile
+# takes milliseconds.
+#
+#   prof = cycle_profile(rows, lead_length=32, targets=["7", "5.3"])
+#   prof["labels"][prof["row_type"][i]]     # cycle type of row i, e.g. "4.2"
+#   prof["flagged_rows"]["5.3"]             # indices of rows with a 5- and a 3-cycle
+#   prof["coursing_orders"][k]              # e.g. "8753246" at lead head k
+#
+# Requires numpy.
+
+import numpy as np
+
+from extent import positions_array
+from permutation import rows_array
+from place_notation import STAGE_SYMBOLS
+
+
+def cycle_lengths(perms):
+    """
+    For every row and every bell, the length of the cycle that bell is in,
+    shape (n_rows, stage).
+    """
+    n_rows, n = perms.shape
+    step = positions_array(perms).astype(np.intp)   # place i -> place the bell from i moves to
+    start = np.arange(n)[None, :]
+    lengths = np.zeros((n_rows, n), dtype=np.uint8)
+    cur = step
+    for k in range(1, n + 1):
+        lengths[(cur == start) & (lengths == 0)] = k
+        cur = np.take_along_axis(step, cur, axis=1)
+    return lengths
+
+
+def cycle_types(lengths):
+    """
+    counts[r, k] = number of k-cycles in row r (column 0 unused), from
+    cycle_lengths output.
+    """
+    n_rows, n = lengths.shape
+    counts = np.zeros((n_rows, n + 1), dtype=np.uint8)
+    for k in range(1, n + 1):
+        counts[:, k] = (lengths == k).sum(axis=1) // k
+    return counts
+
+
+def periods(lengths):
+    """Period of each row (lcm of its cycle lengths), as Perm.period()."""
+    return np.lcm.reduce(lengths.astype(np.int64), axis=1)
+
+
+def type_label(counts_row, ignore_fixed=True):
+    """Cycle type as a partition string, largest first, e.g. "4.2.1.1" (or "4.2")."""
+    parts = []
+    for k in range(len(counts_row) - 1, 0, -1):
+        if k == 1 and ignore_fixed:
+            break
+        parts.extend([str(k)] * int(counts_row[k]))
+    return ".".join(parts) or ("1" if ignore_fixed else "")
+
+
+def parse_type(target, stage, ignore_fixed=True):
+    """
+    A cycle type given as "5.3", (5, 3) or [5, 3, 1] as a counts vector
+    comparable with cycle_types rows. With ignore_fixed, 1-cycles are
+    not compared (column 1 is left at 0 and masked off by match_types).
+    """
+    if isinstance(target, str):
+        target = [int(p) for p in target.split(".") if p]
+    target = [int(k) for k in target]
+    for k in target:
+        if not 1 <= k <= stage:
+            raise ValueError(f"cycle length {k} is not in 1..{stage}")
+    if sum(target) > stage:
+        raise ValueError(f"cycle type {target} is bigger than stage {stage}")
+    counts = np.zeros(stage + 1, dtype=np.uint8)
+    for k in target:
+        counts[k] += 1
+    if ignore_fixed:
+        counts[1] = 0
+    else:
+        counts[1] += stage - sum(target)
+    return counts
+
+
+def match_types(counts, target, ignore_fixed=True):
+    """Boolean mask of rows whose cycle type is `target`."""
+    stage = counts.shape[1] - 1
+    want = parse_type(target, stage, ignore_fixed)
+    cols = slice(2, None) if ignore_fixed else slice(1, None)
+    return (counts[:, cols] == want[cols]).all(axis=1)
+
+
+def coursing_orders(perms, hunt=1):
+    """
+    Coursing order of each row, shape (n_rows, stage - 1): the bells in
+    even places going up then odd places coming down, without the hunt
+    bell, rotated to start at the tenor. Rounds on 8 gives 8753246.
+    """
+    n_rows, n = perms.shape
+    order = list(range(1, n, 2)) + list(range(n - 1 if n % 2 else n - 2, -1, -2))
+    seq = perms[:, order]
+    seq = seq[seq != hunt].reshape(n_rows, n - 1)
+    tenor = n if hunt != n else n - 1
+    shift = np.argmax(seq == tenor, axis=1)
+    idx = (shift[:, None] + np.arange(n - 1)[None, :]) % (n - 1)
+    return np.take_along_axis(seq, idx, axis=1)
+
+
+def _bells_to_strings(arr):
+    table = np.frombuffer(("\0" + STAGE_SYMBOLS).encode("ascii"), dtype=np.uint8)
+    return [bytes(r).decode("ascii") for r in table[arr]]
+
+
+def cycle_profile(rows, lead_length=None, targets=(), ignore_fixed=True, hunt=1):
+    """
+    Cycle structure of a touch.
+
+    Returns a dict:
+      labels          distinct cycle types found, as type_label strings
+      row_type        per row, index into labels (int array)
+      period          per row period (int array)
+      type_counts     {label: rows with that type}
+      flagged_rows    {target: indices of rows of that type}
+      lead_heads      indices of lead head rows (if lead_length given)
+      coursing_orders coursing order string at each lead head
+      flagged_leads   {target: lead numbers whose lead head is of that type}
+    """
+    perms = rows_array(rows)
+    lengths = cycle_lengths(perms)
+    counts = cycle_types(lengths)
+
+    key = counts[:, 2:] if ignore_fixed else counts[:, 1:]
+    uniq, row_type = np.unique(key, axis=0, return_inverse=True)
+    row_type = row_type.ravel()
+    pad = np.zeros((len(uniq), counts.shape[1] - key.shape[1]), dtype=counts.dtype)
+    labels = [type_label(c, ignore_fixed) for c in np.concatenate([pad, uniq], axis=1)]
+    tally = np.bincount(row_type, minlength=len(labels))
+
+    out = {
+        "labels": labels,
+        "row_type": row_type,
+        "period": periods(lengths),
+        "type_counts": {lab: int(n) for lab, n in zip(labels, tally)},
+        "flagged_rows": {},
+        "lead_heads": None,
+        "coursing_orders": None,
+        "flagged_leads": {},
+    }
+
+    masks = {t: match_types(counts, t, ignore_fixed) for t in targets}
+    for t, m in masks.items():
+        out["flagged_rows"][t] = np.flatnonzero(m)
+
+    if lead_length:
+        heads = np.arange(0, len(rows), lead_length)
+        out["lead_heads"] = heads
+        out["coursing_orders"] = _bells_to_strings(coursing_orders(perms[heads], hunt))
+        for t, m in masks.items():
+            out["flagged_leads"][t] = np.flatnonzero(m[heads])
+    return out
@@ -0,0 +1,294 @@
+# extent.py
+# Full-extent baselines for tenor_metrics / rank_all_pairs / pattern counts.
+#
+# For stages up to 9 or so the whole extent is small enough to hold as one
+# (stage!, stage) uint8 array, row r being the permutation of lexicographic
+# rank r. It is built in bulk from the extent of stage-1 (no Python tuple
+# per row), and all the statistics below run on that array, and on the
+# matching array of bell positions, with NumPy.
+#
+# The results have the same shape as the list-of-strings functions in
+# tenors_dist_chart.py so they can be compared directly:
+#
+#   base = extent_rank_all_pairs(8)           # cached on disk after first run
+#   mine = rank_all_pairs(course_rows(pn, 8))
+#
+# Baselines are cached as json under $TINY_TOWER_CACHE (default
+# ~/.cache/tiny-tower/extent). Requires numpy.
+
+import json
+import math
+import os
+from itertools import combinations
+
+import numpy as np
+
+from place_notation import STAGE_SYMBOLS
+
+MAX_EXTENT_STAGE = 10
+
+
+# ---------- extent generation ----------
+
+def extent_array(stage):
+    """
+    Every row of the extent as a (stage!, stage) uint8 array of bells
+    1..stage, in lexicographic order, so row index == permutation rank.
+    """
+    if not (1 <= stage <= MAX_EXTENT_STAGE):
+        raise ValueError(f"extent stage must be 1..{MAX_EXTENT_STAGE}, got {stage}")
+
+    perms = np.zeros((1, 1), dtype=np.uint8)  # extent of 1, as 0-based bells
+    for m in range(1, stage):
+        # rows of the extent of m+1 starting with `first` are `first` followed
+        # by the extent of m with every bell >= first bumped up by one
+        first = np.arange(m + 1, dtype=np.uint8)[:, None, None]
+        out = np.empty((m + 1, len(perms), m + 1), dtype=np.uint8)
+        out[:, :, 0] = first[:, :, 0]
+        out[:, :, 1:] = perms[None] + (perms[None] >= first)
+        perms = out.reshape(-1, m + 1)
+    perms += 1
+    return perms
+
+
+def rank_of(row):
+    """Lexicographic rank of a row (string or sequence of bells) in its extent."""
+    if isinstance(row, str):
+        row = [STAGE_SYMBOLS.index(c) + 1 for c in row]
+    n = len(row)
+    rank = 0
+    for i, b in enumerate(row):
+        smaller_later = sum(1 for c in row[i + 1:] if c < b)
+        rank += smaller_later * math.factorial(n - 1 - i)
+    return rank
+
+
+def row_at(rank, stage):
+    """The row string with the given lexicographic rank."""
+    remaining = list(range(1, stage + 1))
+    out = []
+    for i in range(stage - 1, -1, -1):
+        q, rank = divmod(rank, math.factorial(i))
+        out.append(remaining.pop(q))
+    return "".join(STAGE_SYMBOLS[b - 1] for b in out)
+
+
+def positions_array(perms):
+    """pos[r, bell - 1] = place (0-based) of bell in row r."""
+    n_rows, n = perms.shape
+    pos = np.empty_like(perms)
+    pos[np.arange(n_rows)[:, None], perms.astype(np.intp) - 1] = np.arange(n, dtype=perms.dtype)
+    return pos
+
+
+# ---------- pair distances ----------
+
+def pair_distances(pos, a, b, include_wraparounds=False):
+    """
+    Vectorised _distances_for_pair on a positions array: same-row distance,
+    or for odd rows with a successor (when include_wraparounds) the minimum
+    of that and the wrap distance into the next row.
+    """
+    n = pos.shape[1]
+    pa = pos[:, a - 1].astype(np.int16)
+    pb = pos[:, b - 1].astype(np.int16)
+    d = np.abs(pa - pb)
+    if include_wraparounds:
+        i = np.arange(1, len(d) - 1, 2)
+        wrap = np.minimum(n + pb[i + 1] - pa[i], n + pa[i + 1] - pb[i])
+        d[i] = np.minimum(d[i], wrap)
+    return d
+
+
+def _adjacent_runs(adj):
+    """Lengths of runs of True in a boolean vector."""
+    edges = np.diff(np.concatenate(([0], adj.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return ends - starts
+
+
+def distance_summary(dists, pair, n_bells):
+    """The tenor_metrics dict, computed from a distance vector with NumPy."""
+    total = len(dists)
+    counts = np.bincount(dists, minlength=n_bells)
+    mu = float(dists.mean())
+
+    # median from the histogram: no sort of the full vector
+    cum = np.cumsum(counts)
+    mid = total // 2
+    hi = int(np.searchsorted(cum, mid + 1))
+    if total % 2:
+        med = float(hi)
+    else:
+        lo = int(np.searchsorted(cum, mid))
+        med = 0.5 * (lo + hi)
+
+    runs = _adjacent_runs(dists == 1)
+    dmin, dmax = 1, n_bells - 1
+    if dmax == dmin:
+        together = 1.0
+    else:
+        together = 1.0 - (max(dmin, min(mu, dmax)) - dmin) / (dmax - dmin)
+
+    return {
+        "pair": pair,
+        "n_rows": total,
+        "mean_distance": mu,
+        "median_distance": med,
+        "std_distance": float(dists.std()) if total > 1 else 0.0,
+        "max_distance": int(dists.max()),
+        "adjacency_rate": float(counts[1]) / total if n_bells > 1 else 0.0,
+        "adjacency_mean_run": float(runs.mean()) if len(runs) else 0.0,
+        "adjacency_max_run": int(runs.max()) if len(runs) else 0,
+        "togetherness_score": together,
+        "distribution_pct": {d: float(counts[d]) / total * 100.0 for d in range(1, n_bells)},
+    }
+
+
+# ---------- pattern counts ----------
+
+def _window_codes(perms, width, base):
+    """Every `width`-long window of every row, packed base-`base` into int64."""
+    n_rows, n = perms.shape
+    codes = np.zeros((n_rows, n - width + 1), dtype=np.int64)
+    for k in range(width):
+        codes *= base
+        codes += perms[:, k:n - width + 1 + k]
+    return codes.ravel()
+
+
+def _decode(code, width, base):
+    out = []
+    for _ in range(width):
+        code, b = divmod(code, base)
+        out.append(STAGE_SYMBOLS[b - 1])
+    return "".join(reversed(out))
+
+
+def pattern_counts(perms, width=5, include_wraparounds=False, front_only=False):
+    """
+    Counts of `width`-long bell patterns over a rows array, returned like
+    count_patterns: [(count, pattern), ...] highest count first.
+
+    front_only counts just the first `width` bells of each row (the front
+    music count_patterns looks at). With include_wraparounds, odd rows are
+    scanned joined to the following row instead of on their own, as in
+    count_patterns; even rows are scanned within-row.
+    """
+    n_rows, n = perms.shape
+    # joined odd+even rows are 2n long, so with wraparounds a window can be
+    # wider than one row
+    if width <= 0 or width > (2 * n if include_wraparounds and not front_only else n):
+        return []
+
+    base = n + 1
+    if front_only:
+        codes = _window_codes(perms[:, :width], width, base)
+    elif include_wraparounds:
+        odd_idx = np.arange(1, n_rows - 1, 2)
+        joined = np.concatenate([perms[odd_idx], perms[odd_idx + 1]], axis=1)
+        codes = _window_codes(joined, width, base)
+        if width <= n:
+            codes = np.concatenate([_window_codes(perms[0::2], width, base), codes])
+    else:
+        codes = _window_codes(perms, width, base)
+
+    uniq, counts = np.unique(codes, return_counts=True)
+    out = [(int(c), _decode(int(u), width, base)) for u, c in zip(uniq, counts)]
+    out.sort(key=lambda t: (-t[0], t[1]))
+    return out
+
+
+# ---------- cached baselines ----------
+
+def cache_dir():
+    return os.environ.get("TINY_TOWER_CACHE",
+                          os.path.join(os.path.expanduser("~"), ".cache", "tiny-tower", "extent"))
+
+
+def _cached(name, compute, restore=lambda v: v):
+    path = os.path.join(cache_dir(), name)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return restore(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+    value = compute()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(tmp, path)
+    return value
+
+
+def _restore_summary(s):
+    s["pair"] = tuple(s["pair"])
+    s["distribution_pct"] = {int(d): v for d, v in s["distribution_pct"].items()}
+    return s
+
+
+def _wrap_tag(include_wraparounds):
+    return "__wraparound" if include_wraparounds else ""
+
+
+def extent_tenor_metrics(stage, tenor_pair=None, include_wraparounds=False):
+    """
+    tenor_metrics over the full extent of `stage`, cached on disk. The pair
+    defaults to the back two bells, (stage - 1, stage).
+    """
+    if tenor_pair is None:
+        tenor_pair = (stage - 1, stage)
+    a, b = tenor_pair
+    for bell in (a, b):
+        if not 1 <= bell <= stage:
+            raise ValueError(f"bell {bell} is not in a stage {stage} row")
+
+    def compute():
+        pos = positions_array(extent_array(stage))
+        return distance_summary(pair_distances(pos, a, b, include_wraparounds), tenor_pair, stage)
+
+    name = f"tenor_metrics__s{stage}__{a}-{b}{_wrap_tag(include_wraparounds)}.json"
+    return _cached(name, compute, _restore_summary)
+
+
+def _rank_key(s):
+    """
+    rank_all_pairs order. Across a full extent most pairs tie, so float noise
+    from mean()/std() is rounded away and ties go to the lower pair.
+    """
+    return (
+        round(s["mean_distance"], 9),
+        s["max_distance"],
+        round(s["std_distance"], 9),
+        -round(s["adjacency_rate"], 9),
+        tuple(s["pair"]),
+    )
+
+
+def extent_rank_all_pairs(stage, exclude={1}, include_wraparounds=False):
+    """rank_all_pairs over the full extent of `stage`, cached on disk."""
+    bells = [b for b in range(1, stage + 1) if b not in (exclude or ())]
+
+    def compute():
+        pos = positions_array(extent_array(stage))
+        summaries = [distance_summary(pair_distances(pos, a, b, include_wraparounds), (a, b), stage)
+                     for a, b in combinations(bells, 2)]
+        summaries.sort(key=_rank_key)
+        return summaries
+
+    ex = "".join(STAGE_SYMBOLS[b - 1] for b in sorted(exclude or ())) or "none"
+    name = f"rank_all_pairs__s{stage}__ex{ex}{_wrap_tag(include_wraparounds)}.json"
+    return _cached(name, compute, lambda v: sorted((_restore_summary(s) for s in v), key=_rank_key))
+
+
+def extent_pattern_counts(stage, width=5, include_wraparounds=False, front_only=False):
+    """pattern_counts over the full extent of `stage`, cached on disk."""
+    def compute():
+        return pattern_counts(extent_array(stage), width, include_wraparounds, front_only)
+
+    front = "__front" if front_only else ""
+    name = f"patterns__s{stage}__w{width}{front}{_wrap_tag(include_wraparounds)}.json"
+    return _cached(name, compute, lambda v: [tuple(t) for t in v])
@@ -0,0 +1,130 @@
+# falseness.py
+# False lead heads / false course heads, for fast truth checks.
+#
+# If a method's lead, rung from rounds, is the rows r_0 .. r_{n-1}, the lead
+# with head L contains the rows L.r_i (see permutation.transpose). Two leads
+# with heads L and M share a row exactly when
+#
+#   M^-1 . L  is in  F = { r_j . r_i^-1 : i != j }
+#
+# F is the method's set of false lead heads. It depends only on the PN and
+# stage, so it is worked out once (and cached) and a touch, given as its list
+# of lead heads, is then true iff no lead head lands in another's M.F. Calls
+# only change a lead's last change, i.e. the *next* lead head, so this holds
+# for any touch made of whole leads of the method.
+#
+# Running the same calculation on the rows of the plain course gives false
+# course heads, for touches built from whole plain courses.
+#
+#   flh = false_lead_heads("x58x14.58x58.36.14x14.58x14x18,18", 8)
+#   heads = touch_lead_heads("x58x14...,18", 8, ["p", "14", "p", ...])
+#   is_true_touch(heads, flh)
+#
+#   checker = TruthChecker(flh)     # incremental, for searches
+#   if checker.add(lead_head): ...  # False: this lead would make it false
+#   checker.remove(lead_head)       # backtrack
+
+from functools import lru_cache
+
+from permutation import inverse, is_rounds, transpose
+from place_notation import apply_token, course_rows, expand_place_notation, lead_rows, rounds_for_stage
+
+
+def false_heads(rows):
+    """
+    { r_j . r_i^-1 : i != j } for a block of rows rung from rounds.
+
+    Contains rounds if the block repeats a row itself, which makes every
+    touch of it false.
+    """
+    inverses = [inverse(r) for r in rows]
+    out = set()
+    for i, inv_i in enumerate(inverses):
+        for j, r_j in enumerate(rows):
+            if i != j:
+                out.add(transpose(r_j, inv_i))
+    return frozenset(out)
+
+
+@lru_cache(maxsize=256)
+def false_lead_heads(pn, stage):
+    """False lead heads of a method (rows of one lead, from rounds)."""
+    return false_heads(lead_rows(pn, stage)[:-1])
+
+
+@lru_cache(maxsize=256)
+def false_course_heads(pn, stage):
+    """False course heads of a method (rows of the plain course, from rounds)."""
+    return false_heads(course_rows(pn, stage))
+
+
+def touch_lead_heads(pn, stage, lead_ends):
+    """
+    Lead heads of a touch, starting from rounds.
+
+    lead_ends has one entry per lead: "p" (or None) for the plain lead end,
+    or a PN token to ring instead of the lead's last change, e.g. "14" for
+    a bob in Major or "1234" for a single. Returns len(lead_ends) heads,
+    i.e. the head of each lead rung (not the one after the last).
+    """
+    tokens = expand_place_notation(pn)
+    body = lead_rows(pn, stage)[-2]     # the lead end row, from rounds
+    head = rounds_for_stage(stage)
+    heads = []
+    for le in lead_ends:
+        heads.append(head)
+        last = tokens[-1] if le in (None, "p", "P") else le
+        head = apply_token(transpose(head, body), last)
+    return heads
+
+
+def is_true_touch(lead_heads, false_set):
+    """
+    Truth of a touch from its lead heads and the method's false set
+    (false_lead_heads, or false_course_heads with course heads).
+    """
+    checker = TruthChecker(false_set)
+    return all(checker.add(h) for h in lead_heads)
+
+
+class TruthChecker:
+    """
+    Incremental truth check for searches: add() is one set lookup, plus
+    recording the heads the new lead rules out; remove() undoes an add so
+    a search can backtrack.
+    """
+
+    def __init__(self, false_set):
+        self.false_set = tuple(false_set)
+        self.internally_false = any(is_rounds(h) for h in self.false_set)
+        self._blocked = {}
+        self.heads = []
+
+    def is_blocked(self, head):
+        return self.internally_false or self._blocked.get(head, 0) > 0
+
+    def add(self, head):
+        """Add a lead head; returns False (and adds nothing) if that makes the touch false."""
+        if self.is_blocked(head):
+            return False
+        blocked = self._blocked
+        blocked[head] = blocked.get(head, 0) + 1
+        for f in self.false_set:
+            h = transpose(head, f)
+            blocked[h] = blocked.get(h, 0) + 1
+        self.heads.append(head)
+        return True
+
+    def remove(self, head=None):
+        """Remove a lead head (default: the last one added)."""
+        if head is None:
+            head = self.heads.pop()
+        else:
+            self.heads.remove(head)
+        blocked = self._blocked
+        for h in (head, *(transpose(head, f) for f in self.false_set)):
+            n = blocked[h] - 1
+            if n:
+                blocked[h] = n
+            else:
+                del blocked[h]
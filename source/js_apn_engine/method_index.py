@@ -0,0 +1,202 @@
+# method_index.py
+# "Which methods behave most like this one?" — nearest neighbours by
+# pair-distance profile.
+#
+# Each method's rank_all_pairs output is flattened into a fixed-length
+# vector (same pair order and fields for every method of a stage), and the
+# vectors for a library of methods are kept in one float32 NumPy matrix.
+# Queries compute distances to every stored vector in a single matrix
+# product, so k-NN over thousands of methods takes milliseconds.
+#
+#   idx = MethodIndex(stage=8)
+#   idx.add_pn("Bristol", "x58x14.58x58.36.14x14.58x14x18,18", 8)
+#   idx.add_pn("Yorkshire", "x38x14x58x16x12x38x14x78,12", 8)
+#   idx.nearest_pn("x38x14x1258x36x14x58x16x78,12", 8, k=5)
+#   idx.save("major.npz")
+#
+# Requires numpy.
+
+from itertools import combinations
+
+import numpy as np
+
+from tenors_dist_chart import rank_all_pairs
+
+# per-pair scalar features, in vector order; distribution_pct follows them
+PAIR_FIELDS = ("mean_distance", "std_distance", "adjacency_rate", "togetherness_score")
+
+
+def vector_pairs(stage, exclude={1}):
+    """The bell pairs a stage's vectors cover, in vector order."""
+    bells = [b for b in range(1, stage + 1) if b not in exclude]
+    return list(combinations(bells, 2))
+
+
+def vector_length(stage, exclude={1}):
+    return len(vector_pairs(stage, exclude)) * (len(PAIR_FIELDS) + stage - 1)
+
+
+def method_vector(rows, exclude={1}, include_wraparounds=False):
+    """
+    Fixed-length fingerprint of a method from its all-pairs metrics.
+
+    For each pair (in vector_pairs order): mean and std distance scaled by
+    the largest possible distance, adjacency rate, togetherness score, then
+    the distance distribution as fractions for d = 1..stage-1.
+    """
+    stage = len(rows[0])
+    by_pair = {s["pair"]: s for s in rank_all_pairs(rows, exclude=exclude,
+                                                    include_wraparounds=include_wraparounds)}
+    dmax = max(stage - 1, 1)
+    out = []
+    for pair in vector_pairs(stage, exclude):
+        s = by_pair[pair]
+        out.append(s["mean_distance"] / dmax)
+        out.append(s["std_distance"] / dmax)
+        out.append(s["adjacency_rate"])
+        out.append(s["togetherness_score"])
+        dist = s["distribution_pct"]
+        out.extend(dist[d] / 100.0 for d in range(1, stage))
+    return np.asarray(out, dtype=np.float32)
+
+
+class MethodIndex:
+    """
+    Compact k-NN index of method fingerprints for one stage.
+
+    Vectors live in a preallocated float32 matrix that grows by doubling,
+    so adding methods one at a time is amortised O(1). Re-adding a name
+    replaces its vector.
+    """
+
+    def __init__(self, stage, exclude={1}, include_wraparounds=False, capacity=256):
+        self.stage = stage
+        self.exclude = frozenset(exclude)
+        self.include_wraparounds = include_wraparounds
+        self.dim = vector_length(stage, self.exclude)
+        self.names = []
+        self._slot = {}
+        self._vecs = np.zeros((capacity, self.dim), dtype=np.float32)
+        self._sqnorms = np.zeros(capacity, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._slot
+
+    @property
+    def vectors(self):
+        return self._vecs[:len(self.names)]
+
+    # ---------- adding ----------
+
+    def vector_for_rows(self, rows):
+        if len(rows[0]) != self.stage:
+            raise ValueError(f"rows are stage {len(rows[0])}, index is stage {self.stage}")
+        return method_vector(rows, exclude=self.exclude,
+                             include_wraparounds=self.include_wraparounds)
+
+    def add_vector(self, name, vec):
+        vec = np.asarray(vec, dtype=np.float32)
+        if vec.shape != (self.dim,):
+            raise ValueError(f"vector has shape {vec.shape}, expected ({self.dim},)")
+
+        i = self._slot.get(name)
+        if i is None:
+            i = len(self.names)
+            if i == len(self._vecs):
+                self._grow(max(1, 2 * i))
+            self._slot[name] = i
+            self.names.append(name)
+        self._vecs[i] = vec
+        self._sqnorms[i] = vec @ vec
+
+    def add(self, name, rows):
+        self.add_vector(name, self.vector_for_rows(rows))
+
+    def add_pn(self, name, pn, stage=None):
+        from place_notation import course_rows
+        self.add(name, course_rows(pn, stage or self.stage))
+
+    def _grow(self, capacity):
+        vecs = np.zeros((capacity, self.dim), dtype=np.float32)
+        sqnorms = np.zeros(capacity, dtype=np.float32)
+        n = len(self.names)
+        vecs[:n] = self._vecs[:n]
+        sqnorms[:n] = self._sqnorms[:n]
+        self._vecs, self._sqnorms = vecs, sqnorms
+
+    # ---------- queries ----------
+
+    def nearest_many(self, queries, k=10):
+        """
+        k nearest stored methods (Euclidean) for each row of `queries`.
+        Returns a list, per query, of (name, distance) closest first.
+        """
+        q = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        n = len(self.names)
+        if n == 0:
+            return [[] for _ in range(len(q))]
+        k = min(k, n)
+
+        # |q - v|^2 = |q|^2 + |v|^2 - 2 q.v, all pairs in one matrix product
+        d2 = (q * q).sum(axis=1)[:, None] + self._sqnorms[:n][None, :] - 2.0 * (q @ self.vectors.T)
+        np.maximum(d2, 0.0, out=d2)
+
+        if k < n:
+            top = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n), (len(q), n))
+        top_d2 = np.take_along_axis(d2, top, axis=1)
+        order = np.argsort(top_d2, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_d = np.sqrt(np.take_along_axis(top_d2, order, axis=1))
+
+        return [[(self.names[j], float(d)) for j, d in zip(ids, ds)]
+                for ids, ds in zip(top, top_d)]
+
+    def nearest(self, vec, k=10):
+        return self.nearest_many(vec, k)[0]
+
+    def nearest_rows(self, rows, k=10):
+        return self.nearest(self.vector_for_rows(rows), k)
+
+    def nearest_pn(self, pn, stage=None, k=10):
+        from place_notation import course_rows
+        return self.nearest_rows(course_rows(pn, stage or self.stage), k)
+
+    def like(self, name, k=10):
+        """Methods most like one already in the index (excluding itself)."""
+        hits = self.nearest(self._vecs[self._slot[name]], k + 1)
+        return [h for h in hits if h[0] != name][:k]
+
+    # ---------- persistence ----------
+
+    def save(self, filename):
+        np.savez_compressed(
+            filename,
+            stage=self.stage,
+            exclude=np.array(sorted(self.exclude), dtype=np.int16),
+            include_wraparounds=self.include_wraparounds,
+            names=np.array(self.names, dtype=str),
+            vectors=self.vectors,
+        )
+        return filename
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            idx = cls(int(data["stage"]),
+                      exclude=set(int(b) for b in data["exclude"]),
+                      include_wraparounds=bool(data["include_wraparounds"]),
+                      capacity=max(len(data["names"]), 1))
+            vecs = data["vectors"]
+            if vecs.shape[1] != idx.dim:
+                raise ValueError(f"{filename}: vectors have width {vecs.shape[1]}, expected {idx.dim}")
+            n = len(data["names"])
+            idx.names = [str(s) for s in data["names"]]
+            idx._slot = {name: i for i, name in enumerate(idx.names)}
+            idx._vecs[:n] = vecs
+            idx._sqnorms[:n] = (vecs * vecs).sum(axis=1)
+        return idx
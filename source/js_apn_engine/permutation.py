@@ -0,0 +1,63 @@
+# permutation.py
+# Rows as permutations, for the Python analysis tools.
+#
+# A row string is read as the map place -> bell. Transposing a row by
+# another gives the row you get by ringing the second one starting from
+# the first:
+#
+#   transpose(lead_head, r)[k] == lead_head[index of r[k] in rounds]
+#
+# so the i-th row of a lead whose head is L is transpose(L, lead_rows[i]).
+# transpose is associative, rounds is the identity and inverse() undoes a row:
+#
+#   transpose(r, inverse(r)) == transpose(inverse(r), r) == rounds
+#
+# rows_array() turns a list of row strings into one NumPy array, for the
+# bulk analysis modules; numpy is only imported when it is called.
+
+from place_notation import STAGE_SYMBOLS, rounds_for_stage
+
+
+def transpose(row, by):
+    """Ring `by` starting from `row` (both the same stage)."""
+    return "".join(row[STAGE_SYMBOLS.index(c)] for c in by)
+
+
+def inverse(row):
+    """The row that takes `row` back to rounds."""
+    out = [""] * len(row)
+    for place, bell in enumerate(row):
+        out[STAGE_SYMBOLS.index(bell)] = STAGE_SYMBOLS[place]
+    return "".join(out)
+
+
+def is_rounds(row):
+    return row == rounds_for_stage(len(row))
+
+
+def rows_array(rows):
+    """
+    Row strings as a (n_rows, stage) uint8 array of bells 1..stage.
+    Raises ValueError unless every row is a permutation of the same stage.
+    """
+    import numpy as np
+
+    stage = len(rows[0])
+    for r in rows:
+        if len(r) != stage:
+            raise ValueError(f"row {r!r} is not {stage} bells long")
+    lookup = np.zeros(128, dtype=np.uint8)
+    for i, c in enumerate(STAGE_SYMBOLS[:stage]):
+        lookup[ord(c)] = lookup[ord(c.lower())] = i + 1
+    try:
+        buf = np.frombuffer("".join(rows).encode("ascii"), dtype=np.uint8).reshape(len(rows), stage)
+    except UnicodeEncodeError:
+        raise ValueError("rows contain a character that isn't a bell symbol") from None
+    perms = lookup[buf]
+
+    # a row is a permutation of 1..stage iff no symbol is unknown (0) and
+    # its sorted bells are exactly 1..stage
+    bad = np.flatnonzero((np.sort(perms, axis=1) != np.arange(1, stage + 1, dtype=np.uint8)).any(axis=1))
+    if len(bad):
+        raise ValueError(f"row {rows[bad[0]]!r} is not a row on {stage} bells")
+    return perms
@@ -0,0 +1,134 @@
+# place_notation.py
+# Plain place notation → rows, for the Python analysis tools.
+#
+# This mirrors generateList/applyTokenToRow in notation.js for standard
+# notation: 'x' (or 'X', '-') crosses, '.' separates place tokens, and ','
+# gives the usual palindromic segments ("x16x16x16,12"). The extended
+# expression syntax handled by newAlg.js (multipliers, slices, ';') is not
+# supported here.
+
+# note the lack of I, O in PN chars -- that's standard
+STAGE_SYMBOLS = "1234567890ETABCDFGHJKLMNPQRSUV"
+X_CHARS = {"x", "X", "-"}
+CANONICAL_X_CHAR = "x"
+
+
+def rounds_for_stage(stage):
+    if not (1 <= stage <= len(STAGE_SYMBOLS)):
+        raise ValueError(f"stage {stage} out of supported range 1..{len(STAGE_SYMBOLS)}")
+    return STAGE_SYMBOLS[:stage]
+
+
+def symbol_to_bell(sym):
+    """1-based bell (or place) number for a symbol, e.g. '0' -> 10, 'E' -> 11."""
+    idx = STAGE_SYMBOLS.find(sym.upper())
+    if idx < 0:
+        raise ValueError(f"unknown bell symbol {sym!r}")
+    return idx + 1
+
+
+def tokenize(pn):
+    """
+    Split a flat PN string into tokens: "x16x16.12" -> ["x", "16", "x", "16", "12"].
+    """
+    tokens = []
+    cur = ""
+    for ch in pn.strip():
+        if ch in X_CHARS:
+            if cur:
+                tokens.append(cur)
+                cur = ""
+            tokens.append(CANONICAL_X_CHAR)
+        elif ch == ".":
+            if cur:
+                tokens.append(cur)
+                cur = ""
+        elif ch.isspace():
+            continue
+        else:
+            symbol_to_bell(ch)   # validate
+            cur += ch.upper()
+    if cur:
+        tokens.append(cur)
+    return tokens
+
+
+def expand_place_notation(pn):
+    """
+    Token list for one lead. With commas, each segment is a palindrome:
+    tokens + reverse(tokens without last), as in expandCommaPlaceNotation.
+    """
+    raw = str(pn or "").strip()
+    if not raw:
+        return []
+    if "," not in raw:
+        return tokenize(raw)
+
+    out = []
+    for seg in raw.split(","):
+        toks = tokenize(seg)
+        if not toks:
+            continue
+        out.extend(toks)
+        out.extend(toks[:-1][::-1])
+    return out
+
+
+def apply_token(row, token):
+    """Apply one PN token to a row string, making any implicit places."""
+    n = len(row)
+    out = list(row)
+
+    if token == CANONICAL_X_CHAR:
+        for i in range(0, n - 1, 2):
+            out[i], out[i + 1] = row[i + 1], row[i]
+        return "".join(out)
+
+    places = {symbol_to_bell(ch) for ch in token}
+    i = 1  # 1-based walk
+    while i <= n:
+        j = i + 1
+        if i in places or j > n or j in places:
+            i += 1
+            continue
+        out[i - 1], out[j - 1] = row[j - 1], row[i - 1]
+        i += 2
+    return "".join(out)
+
+
+def lead_rows(pn, stage):
+    """
+    Rows of the first lead from rounds, plus the next lead head:
+    len(tokens) + 1 rows, starting with rounds.
+    """
+    rows = [rounds_for_stage(stage)]
+    for t in expand_place_notation(pn):
+        rows.append(apply_token(rows[-1], t))
+    return rows
+
+
+def generate_rows(pn, stage, max_changes=6000):
+    """
+    Plain course rows from rounds back to rounds (inclusive at both ends),
+    or until max_changes is exceeded — same stopping rule as generateList.
+    """
+    rounds = rounds_for_stage(stage)
+    lead_tokens = expand_place_notation(pn)
+    if not lead_tokens:
+        return [rounds]
+
+    rows = [rounds]
+    current = rounds
+    while len(rows) <= max_changes:
+        for t in lead_tokens:
+            current = apply_token(current, t)
+            rows.append(current)
+        if current == rounds:
+            break
+    return rows
+
+
+def course_rows(pn, stage, max_changes=6000):
+    """generate_rows without the closing rounds, so no row is counted twice."""
+    rows = generate_rows(pn, stage, max_changes=max_changes)
+    return rows[:-1] if len(rows) > 1 and rows[-1] == rows[0] else rows
@@ -0,0 +1,185 @@
+# tenors_cli.py
+# Command line front end for tenors_dist_chart.py.
+#
+# Rows come from a file (one row per line), stdin, or a PN string:
+#
+#   python tenors_cli.py metrics --pn x16x16x16,12 --stage 6
+#   python tenors_cli.py rank --rows bristol.txt --top 5
+#   cat rows.txt | python tenors_cli.py patterns --width 6
+#   python tenors_cli.py heatmap --pn ... --stage 10 --title "Ed Royal" --wraparounds
+#   python tenors_cli.py score --pn ... --stage 8 --scheme ~/Documents/score_scheme.csv
+#
+# The analysis modules are imported inside each command so that starting the
+# CLI (or spawning many short-lived workers) only pays for what it uses.
+
+import argparse
+import json
+import sys
+
+
+def read_rows(args, closing_rounds=False):
+    """
+    Rows from args.pn + args.stage (the plain course, with the closing
+    rounds if closing_rounds is set), or else from the file args.rows or
+    stdin, one or more rows per line, '#' starting a comment.
+    """
+    if args.pn is not None:
+        if args.stage is None:
+            raise SystemExit("--pn needs --stage")
+        from place_notation import course_rows, generate_rows
+        gen = generate_rows if closing_rounds else course_rows
+        return gen(args.pn, args.stage, max_changes=args.max_changes)
+
+    if args.rows is None or args.rows == "-":
+        text = sys.stdin.read()
+    else:
+        with open(args.rows, encoding="utf-8") as f:
+            text = f.read()
+
+    rows = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            rows.extend(line.split())
+    if not rows:
+        raise SystemExit("no rows given")
+    if len({len(r) for r in rows}) != 1:
+        raise SystemExit("rows must all be the same length")
+    return rows
+
+
+def parse_bell(sym):
+    from place_notation import symbol_to_bell
+    try:
+        return symbol_to_bell(sym.strip())
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+
+def parse_bells(s):
+    """Comma separated bell symbols, e.g. "1,2" or "9,0,E" -> {9, 10, 11}."""
+    return {parse_bell(b) for b in s.split(",") if b.strip()} if s else set()
+
+
+def parse_pair(s):
+    bells = [parse_bell(b) for b in s.split(",") if b.strip()]
+    if len(bells) != 2:
+        raise SystemExit(f"--pair needs two bells, e.g. 7,8 (got {s!r})")
+    return tuple(bells)
+
+
+def print_json(obj):
+    json.dump(obj, sys.stdout, indent=2, default=list)
+    sys.stdout.write("\n")
+
+
+# ---------- commands ----------
+
+def cmd_metrics(args, rows):
+    from tenors_dist_chart import tenor_metrics
+    n = len(rows[0])
+    pair = parse_pair(args.pair) if args.pair else (n - 1, n)
+    for bell in pair:
+        if not 1 <= bell <= n:
+            raise ValueError(f"bell {bell} is not in a stage {n} row")
+    print_json(tenor_metrics(rows, pair, include_wraparounds=args.wraparounds))
+
+
+def cmd_rank(args, rows):
+    from tenors_dist_chart import rank_all_pairs
+    ranked = rank_all_pairs(rows, exclude=parse_bells(args.exclude),
+                            include_wraparounds=args.wraparounds)
+    print_json(ranked[:args.top] if args.top else ranked)
+
+
+def cmd_heatmap(args, rows):
+    from tenors_dist_chart import generate_distance_heatmap_html
+    print(generate_distance_heatmap_html(rows, args.title, exclude=parse_bells(args.exclude),
+                                         include_wraparounds=args.wraparounds))
+
+
+def cmd_patterns(args, rows):
+    from tenors_dist_chart import count_patterns, add_overlap_scores
+    if args.width != 6:
+        # count_patterns only keeps rows whose front six bells are 1-6
+        raise SystemExit("patterns only supports --width 6")
+    patterns = count_patterns(rows, width=args.width, include_wraparounds=args.wraparounds)
+    if args.overlap:
+        for count, pattern, overlap_score in add_overlap_scores(patterns):
+            print(f"{count}: '{pattern}' {overlap_score}")
+    else:
+        for count, pattern in patterns:
+            print(f"{count}: '{pattern}'")
+
+
+def cmd_score(args, rows):
+    from tenors_dist_chart import calc_score, read_score_scheme
+    print_json(calc_score(rows, read_score_scheme(args.scheme)))
+
+
+def build_parser():
+    rows_args = argparse.ArgumentParser(add_help=False)
+    src = rows_args.add_argument_group("rows")
+    src.add_argument("--rows", metavar="FILE", help="file of rows, one per line ('-' or omitted: stdin)")
+    src.add_argument("--pn", help="place notation; rows are the plain course")
+    src.add_argument("--stage", type=int, help="stage for --pn")
+    src.add_argument("--max-changes", type=int, default=6000)
+    rows_args.add_argument("--wraparounds", action="store_true", help="include hand/back wraparounds")
+    rows_args.add_argument("--profile", metavar="PREFIX",
+                           help="profile the run, writing PREFIX.json and PREFIX.folded")
+
+    parser = argparse.ArgumentParser(prog="tenors_cli.py", description="Bell pair distance analysis.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("metrics", parents=[rows_args], help="tenor_metrics for one pair")
+    p.add_argument("--pair", help="bell pair, e.g. 7,8 or 9,0 (default: the back two bells)")
+    p.set_defaults(func=cmd_metrics)
+
+    p = sub.add_parser("rank", parents=[rows_args], help="rank_all_pairs")
+    p.add_argument("--exclude", default="1", help="bells to leave out, e.g. 1,2")
+    p.add_argument("--top", type=int, default=0, help="only show the best N pairs")
+    p.set_defaults(func=cmd_rank)
+
+    p = sub.add_parser("heatmap", parents=[rows_args], help="write the pair distance heatmap html")
+    p.add_argument("--title", default="no-title")
+    p.add_argument("--exclude", default="1")
+    p.set_defaults(func=cmd_heatmap)
+
+    p = sub.add_parser("patterns", parents=[rows_args], help="count_patterns")
+    p.add_argument("--width", type=int, default=6, help="pattern width (only 6: front-six music)")
+    p.add_argument("--overlap", action="store_true", help="add overlap scores")
+    p.set_defaults(func=cmd_patterns)
+
+    p = sub.add_parser("score", parents=[rows_args], help="music score from a csv scheme")
+    p.add_argument("--scheme", required=True, metavar="CSV", help="pattern,score lines")
+    p.set_defaults(func=cmd_score)
+
+    return parser
+
+
+def run(args, rows):
+    """Run the command, reporting bad input (a ValueError from the analysis) without a traceback."""
+    try:
+        args.func(args, rows)
+    except ValueError as e:
+        raise SystemExit(f"{args.command}: {e}")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    rows = read_rows(args)
+
+    if not args.profile:
+        run(args, rows)
+        return
+
+    from tenors_profile import profiled
+    with profiled() as prof:
+        run(args, rows)
+    prof.write_json(args.profile + ".json")
+    prof.write_collapsed(args.profile + ".folded")
+    print(prof.summary(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,24 @@
+import html as _html
 from collections import Counter
 from itertools import combinations
 
+from place_notation import STAGE_SYMBOLS, symbol_to_bell
+
+# '0' is bell 10, 'E' (or 'e') 11, 'T' 12, ... — symbol_to_bell as a table
+_SYMBOL_TO_BELL = {c: symbol_to_bell(c) for c in STAGE_SYMBOLS + STAGE_SYMBOLS.lower()}
+
 # ---------- core stats helpers ----------
 
+def _rows_to_ints(rows):
+    """
+    Convert rows given as symbol strings like "12345678" or "1234567890ET"
+    to lists of ints (so '0' is bell 10, 'E' bell 11, and so on).
+    Rows that are already lists of ints are returned unchanged.
+    """
+    if isinstance(rows[0], str):
+        return [[_SYMBOL_TO_BELL[c] for c in r] for r in rows]
+    return rows
+
 def _pair_distance_in_row(row, a, b):
     pa = row.index(a)
     pb = row.index(b)
@@ -23,9 +39,9 @@ def pair_min_distance_two_rows(row_this, row_next, a, b):
     """
     # Allow strings like "12345678"
     if isinstance(row_this, str):
-        row_this = [int(c) for c in row_this]
+        row_this = [_SYMBOL_TO_BELL[c] for c in row_this]
     if row_next is not None and isinstance(row_next, str):
-        row_next = [int(c) for c in row_next]
+        row_next = [_SYMBOL_TO_BELL[c] for c in row_next]
 
     # (i) same-row distance
     d_same = _pair_distance_in_row(row_this, a, b)
@@ -125,8 +141,7 @@ def tenor_metrics(rows, tenor_pair=(7, 8), include_wraparounds=False):
     if not rows:
         raise ValueError("rows must be a non-empty list of rows.")
     # Convert from strings like "12345678" → [1,2,3,4,5,6,7,8]
-    if isinstance(rows[0], str):
-        rows = [[int(c) for c in r] for r in rows]
+    rows = _rows_to_ints(rows)
 
     n_bells = len(rows[0])
     a, b = tenor_pair
@@ -164,8 +179,7 @@ def rank_all_pairs(rows, exclude={1}, include_bells=None, include_wraparounds=Fa
     if not rows:
         raise ValueError("rows must be a non-empty list of rows.")
     # Convert from strings if needed
-    if isinstance(rows[0], str):
-        rows = [[int(c) for c in r] for r in rows]
+    rows = _rows_to_ints(rows)
 
     # Build bell set from data unless explicitly specified
     if include_bells is None:
@@ -226,19 +240,32 @@ def generate_distance_heatmap_html(
     include_bells=None,
     include_wraparounds=False,
 ):
-    suffix = f"__wraparound" if include_wraparounds else ""
-    filename = f"pair_distance_heatmap__{title}{suffix}.html"
-
     """
     Create an HTML file with an upper-triangular half-grid of MEAN distances
     between bells A and B. Cell background is a white→orange heatmap
     (higher mean distance = more orange).
     """
+    suffix = f"__wraparound" if include_wraparounds else ""
+    filename = f"pair_distance_heatmap__{title}{suffix}.html"
+
+    out = distance_heatmap_html(rows, title, exclude, include_bells, include_wraparounds)
+    _write_html(filename, out)
+    return filename
+
+def distance_heatmap_html(
+    rows,
+    title="no-title",
+    exclude={1},
+    include_bells=None,
+    include_wraparounds=False,
+):
+    """
+    The heatmap page generate_distance_heatmap_html writes, as a string.
+    """
     if not rows:
         raise ValueError("rows must be a non-empty list of rows.")
     # Convert from strings if needed
-    if isinstance(rows[0], str):
-        rows = [[int(c) for c in r] for r in rows]
+    rows = _rows_to_ints(rows)
 
     # Determine bell set
     if include_bells is None:
@@ -255,6 +282,7 @@ def generate_distance_heatmap_html(
     if len(bells) < 2:
         raise ValueError("Need at least two bells to build a grid.")
 
+    safe_title = _html.escape(str(title))
     n_bells_in_row = len(rows[0])
     dmin, dmax_possible = 1, n_bells_in_row - 1
 
@@ -335,14 +363,14 @@ def generate_distance_heatmap_html(
 
     subtitle = "bell pair distances"
     html = [f"""<!doctype html><meta charset='utf-8'>
-    <title>{title}</title>
+    <title>{safe_title}</title>
     {css}
     """]
     html.append("<table>")
     html.append(f"""
         <table>
             <caption class="caption">
-              <h1 class="cap-title">{title}</h1>
+              <h1 class="cap-title">{safe_title}</h1>
               <span class="subtitle">{subtitle}</span>
             </caption>
     """)
@@ -373,14 +401,13 @@ def generate_distance_heatmap_html(
         html.append("<tr>" + "".join(row_cells) + "</tr>")
     html.append("</table>")
 
-    out = "\n".join(html)
+    return "\n".join(html)
+
+def _write_html(filename, html):
     with open(filename, "w", encoding="utf-8") as f:
-        f.write(out)
-    return filename
+        f.write(html)
 
 
-from collections import Counter
-
 def count_patterns(rows, width=5, include_wraparounds=False):
     """
     Count fixed-width substrings across a list of strings.
@@ -496,6 +523,50 @@ def add_overlap_scores(pattern_counts):
 
 
 
+# ---------- music scoring ----------
+
+def read_score_scheme(filename):
+    """
+    Read a score scheme from csv: one `pattern,score` per line (a header
+    line and '#' comment lines are skipped). Returns a list of
+    (pattern, score) tuples in file order.
+    """
+    import csv
+
+    scheme = []
+    with open(filename, newline="", encoding="utf-8") as f:
+        for rec in csv.reader(f):
+            if not rec or not rec[0].strip() or rec[0].lstrip().startswith("#"):
+                continue
+            pattern = rec[0].strip()
+            try:
+                score = float(rec[1])
+            except (IndexError, ValueError):
+                if not scheme:
+                    continue  # header
+                raise ValueError(f"bad score scheme line: {rec!r}")
+            scheme.append((pattern, score))
+    return scheme
+
+def calc_score(rows, score_scheme):
+    """
+    Music score for a list of row strings.
+
+    score_scheme is a list of (pattern, score) pairs (or a dict). A row scores
+    a pattern once if it starts or ends with it (front or back music), so
+    "5678" in Major scores 56781234-style and 12345678-style rows alike.
+
+    Returns {"score": total, "matches": {pattern: rows_matched}}.
+    """
+    items = score_scheme.items() if isinstance(score_scheme, dict) else score_scheme
+    total = 0.0
+    matches = {}
+    for pattern, score in items:
+        n = sum(1 for r in rows if r.startswith(pattern) or r.endswith(pattern))
+        matches[pattern] = n
+        total += n * score
+    return {"score": total, "matches": matches}
+
 # ---------------------------
 # Example usage:
 # rows = ["12345678", "21345678", "23145678", "23415678", "23451678", "23456178", "23456718", "23456781"]
@@ -521,18 +592,11 @@ def add_overlap_scores(pattern_counts):
 
 # ed royal method
 # x30x14x12.50.16x34x10x16x70.16x16.70.16x16.70x16x10x34x16.50.12x14x30x10
-rows = ["1234567890", "2143658709", "1246385079", "2164830597", "2614385079", "6241830597", "6214385079", "2641358709", "2463157890", "4236518709", "2436157890", "4263518709", "4625381079", "6452830197", "6548231079", "5684320197", "6548230917", "6452839071", "4625380917", "4263589071", "2436859701", "2348657910", "3284569701", "3825467910", "8352647190", "3825461709", "3284567190", "2348651709", "2436815079", "4263180597", "2463815079", "4236180597", "4321685079", "3412658709", "3421567890", "4312658709", "4132567890", "1423658709", "4126385079", "1462830597", "1648203957", "6184029375", "1680492735", "6108947253", "6018492735", "0681947253", "0618492735", "6081429375", "6804123957", "8640219375", "6840123957", "8604219375", "8062491735", "0826947153", "0289641735", "2098467153", "0289647513", "0826945731", "8062497513", "8604295731", "6840925371", "6489023517", "4698205371", "4962803517", "9426083157", "4962801375", "4698203157", "6489021375", "6840912735", "8604197253", "6804912735", "8640197253", "8461092735", "4816029375", "4861203957", "8416029375", "8146203957", "1864029375", "8160492735", "1806947253", "1089674523", "0198765432", "1097856342", "0179583624", "0719856342", "7091583624", "7019856342", "0791865432", "0978164523", "9087615432", "0987164523", "9078615432", "9706851342", "7960583124", "7695081342", "6759803124", "7695083214", "7960582341", "9706853214", "9078652341", "0987562431", "0895764213", "8059672431", "8506974213", "5860794123", "8506971432", "8059674123", "0895761432", "0987516342", "9078153624", "0978516342", "9087153624", "9801756342", "8910765432", "8901674523", "9810765432", "9180674523", "1908765432", "9107856342", "1970583624", "1795038264", "7159302846", "1753920486", "7135294068", "7315920486", "3751294068", "3715920486", "7351902846", "7539108264", "5793012846", "7593108264", "5739012846", "5370921486", "3507294168", "3052791486", "0325974168", "3052794618", "3507296481", "5370924618", "5739026481", "7593206841", "7952308614", "9725036841", "9270538614", "2907358164", "9270531846", "9725038164", "7952301846", "7593210486", "5739124068", "7539210486", "5793124068", "5971320486", "9517302846", "9571038264", "5917302846", "5197038264", "1579302846", "5173920486", "1537294068", "1352749608", "3125476980", "1324567890", "3142658709", "3412567890", "4321658709", "4312567890", "3421576980", "3245179608", "2354716980", "3254179608", "2345716980", "2437561890", "4273658109", "4726351890", "7462538109", "4726358019", "4273650891", "2437568019", "2345760891", "3254670981", "3526479018", "5362740981", "5637249018", "6573429108", "5637241980", "5362749108", "3526471980", "3254617890", "2345168709", "3245617890", "2354168709", "2531467890", "5213476980", "5231749608", "2513476980", "2153749608", "1235476980", "2134567890", "1243658709", "1426385079", "4162830597", "1468203957", "4186029375", "4816203957", "8461029375", "8416203957", "4861230597", "4682135079", "6428310597", "4628135079", "6482310597", "6843201957", "8634029175", "8360421957", "3806249175", "8360429715", "8634027951", "6843209715", "6482307951", "4628037591", "4260835719", "2406387591", "2043685719", "0234865179", "2043681597", "2406385179", "4260831597", "4628013957", "6482109375", "4682013957", "6428109375", "6241803957", "2614830597", "2641385079", "6214830597", "6124385079", "1642830597", "6148203957", "1684029375", "1860492735", "8106947253", "1809674523", "8190765432", "8910674523", "9801765432", "9810674523", "8901647253", "8096142735", "0869417253", "8069142735", "0896417253", "0984671523", "9048765132", "9407861523", "4970685132", "9407865312", "9048763521", "0984675312", "0896473521", "8069743251", "8607942315", "6870493251", "6784092315", "7648902135", "6784091253", "6870492135", "8607941253", "8069714523", "0896175432", "8096714523", "0869175432", "0681974523", "6018947253", "6081492735", "0618947253", "0168492735", "1086947253", "0189674523", "1098765432", "1907856342", "9170583624", "1975038264", "9157302846", "9517038264", "5971302846", "5917038264", "9571083624", "9750186342", "7905813624", "9705186342", "7950813624", "7598031264", "5789302146", "5873901264", "8537092146", "5873902416", "5789304261", "7598032416", "7950834261", "9705384621", "9073586412", "0937854621", "0398756412", "3089576142", "0398751624", "0937856142", "9073581624", "9705318264", "7950132846", "9750318264", "7905132846", "7091538264", "0719583624", "0791856342", "7019583624", "7109856342", "1790583624", "7195038264", "1759302846", "1573920486", "5137294068", "1532749608", "5123476980", "5213749608", "2531476980", "2513749608", "5231794068", "5327190486", "3572914068", "5372190486", "3527914068", "3259741608", "2395476180", "2934571608", "9243756180", "2934576810", "2395478601", "3259746810", "3527948601", "5372498061", "5734290816", "7543928061", "7459320816", "4795230186", "7459321068", "7543920186", "5734291068", "5372419608", "3527146980", "5327419608", "3572146980", "3751249608", "7315294068", "7351920486", "3715294068", "3175920486", "1357294068", "3152749608", "1325476980"]
-
-
-print(tenor_metrics(rows))
-ranked = rank_all_pairs(rows, exclude={1})
-print(ranked[:5])
-# print(generate_distance_heatmap_html(rows, "Bristol Surprise Major", filename="pair_distance_heatmap.html"))
-
-title = "Bristol Surprise Major"
-
-generate_distance_heatmap_html(rows, title, include_wraparounds=True)
-generate_distance_heatmap_html(rows, title)
+#
+# These used to run at import time; use the CLI instead, e.g.:
+#   python tenors_cli.py metrics --pn x30x14x12.50.16x34x10x16x70.16x16.70.16x16.70x16x10x34x16.50.12x14x30x10 --stage 10
+#   python tenors_cli.py rank --pn ... --stage 10 --top 5
+#   python tenors_cli.py heatmap --pn ... --stage 10 --title "Bristol Surprise Major" --wraparounds
 
 # test_rows = [
 #     "12345678",
@@ -560,8 +624,8 @@ generate_distance_heatmap_html(rows, title)
 
 # music detection
 
-# todo, read score_scheme from csv file in ~/Documents
-score = calc_score(rows, score_scheme)
+# score_scheme can now be read from csv (see read_score_scheme):
+# score = calc_score(rows, read_score_scheme(os.path.expanduser("~/Documents/score_scheme.csv")))
 
 
 # exploitable patterns for ed method:
@@ -0,0 +1,240 @@
+# tenors_profile.py
+# Opt-in instrumentation for the analysis functions in tenors_dist_chart.py.
+#
+# Nothing here touches tenors_dist_chart until enable() is called: the hot
+# functions are swapped for timing wrappers in the module's globals, and
+# disable() puts the originals back. So when profiling is off the analysis
+# runs the untouched functions and pays nothing.
+#
+# Usage:
+#
+#   import tenors_dist_chart as tdc
+#   from tenors_profile import profiled
+#
+#   with profiled(track_allocations=True) as prof:
+#       tdc.rank_all_pairs(rows)
+#       tdc.generate_distance_heatmap_html(rows, "Bristol Surprise Major")
+#
+#   prof.write_json("profile.json")
+#   prof.write_collapsed("profile.folded")   # feed to flamegraph.pl / speedscope
+#
+# Calls have to go through the module (tdc.rank_all_pairs) to be seen;
+# a name imported with `from tenors_dist_chart import ...` before enable()
+# still points at the unwrapped function.
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# The stages we care about when a batch run is slow, in pipeline order.
+HOT_FUNCTIONS = (
+    "_rows_to_ints",
+    "tenor_metrics",
+    "rank_all_pairs",
+    "_distances_for_pair",
+    "pair_min_distance_two_rows",
+    "_mean",
+    "_median",
+    "_stdev",
+    "_adjacency_rate",
+    "_run_lengths_adjacent",
+    "distance_distribution",
+    "generate_distance_heatmap_html",
+    "distance_heatmap_html",
+    "_write_html",
+    "count_patterns",
+    "add_overlap_scores",
+)
+
+_active = None   # the Profiler currently patched into a module, if any
+
+
+class _Node:
+    __slots__ = ("name", "calls", "total_s", "child_s", "rows", "alloc_bytes", "children")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_s = 0.0
+        self.child_s = 0.0
+        self.rows = 0
+        self.alloc_bytes = 0
+        self.children = {}
+
+    def child(self, name):
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = _Node(name)
+        return node
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "total_s": self.total_s,
+            "self_s": self.total_s - self.child_s,
+            "rows": self.rows,
+            "alloc_bytes": self.alloc_bytes,
+            "children": [c.to_dict() for c in self.children.values()],
+        }
+
+
+class Profiler:
+    """
+    Collects a call tree for the instrumented functions.
+
+    Each node records call count, inclusive wall time, self time (inclusive
+    minus instrumented children), rows processed (the length of a `rows`
+    argument, where the function takes one) and, if track_allocations is
+    set, the net bytes allocated while the call ran (via tracemalloc, which
+    is itself slow — leave it off when only timing matters).
+    """
+
+    def __init__(self, track_allocations=False):
+        self.track_allocations = track_allocations
+        self.root = _Node("root")
+        self._stack = [self.root]
+        self._module = None
+        self._originals = {}
+        self._started_tracemalloc = False
+
+    # ---------- patching ----------
+
+    def enable(self, module=None, names=HOT_FUNCTIONS):
+        global _active
+        if _active is not None:
+            raise RuntimeError("another Profiler is already enabled")
+        if module is None:
+            import tenors_dist_chart as module
+
+        self._module = module
+        try:
+            for name in names:
+                fn = getattr(module, name, None)
+                if fn is None:
+                    continue
+                setattr(module, name, self._wrap(name, fn))
+                self._originals[name] = fn
+
+            if self.track_allocations and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+        except BaseException:
+            self.disable()   # put back whatever was already patched
+            raise
+        _active = self
+        return self
+
+    def disable(self):
+        global _active
+        for name, fn in self._originals.items():
+            setattr(self._module, name, fn)
+        self._originals = {}
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if _active is self:
+            _active = None
+
+    def _wrap(self, name, fn):
+        code = fn.__code__
+        params = code.co_varnames[:code.co_argcount]
+        rows_pos = params.index("rows") if "rows" in params else None
+        stack = self._stack
+        perf_counter = time.perf_counter
+        track = self.track_allocations
+        traced = tracemalloc.get_traced_memory
+
+        def wrapper(*args, **kwargs):
+            parent = stack[-1]
+            node = parent.child(name)
+            stack.append(node)
+            mem0 = traced()[0] if track else 0
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - t0
+                stack.pop()
+                node.calls += 1
+                node.total_s += elapsed
+                parent.child_s += elapsed
+                if track:
+                    node.alloc_bytes += traced()[0] - mem0
+                if rows_pos is not None:
+                    rows = args[rows_pos] if rows_pos < len(args) else kwargs.get("rows")
+                    if rows is not None:
+                        node.rows += len(rows)
+
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        wrapper.__wrapped__ = fn
+        return wrapper
+
+    # ---------- export ----------
+
+    def to_dict(self):
+        return {
+            "track_allocations": self.track_allocations,
+            "stages": [c.to_dict() for c in self.root.children.values()],
+        }
+
+    def write_json(self, filename):
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return filename
+
+    def collapsed_lines(self):
+        """
+        Collapsed-stack lines ("a;b;c <self microseconds>"), the input format
+        of flamegraph.pl, speedscope and friends.
+        """
+        lines = []
+
+        def walk(node, path):
+            for child in node.children.values():
+                child_path = path + (child.name,)
+                self_us = int(round((child.total_s - child.child_s) * 1e6))
+                if self_us > 0:
+                    lines.append(f"{';'.join(child_path)} {self_us}")
+                walk(child, child_path)
+
+        walk(self.root, ())
+        return lines
+
+    def write_collapsed(self, filename):
+        with open(filename, "w", encoding="utf-8") as f:
+            for line in self.collapsed_lines():
+                f.write(line + "\n")
+        return filename
+
+    def summary(self, limit=15):
+        """Flat table of stages by self time, for printing."""
+        flat = {}
+
+        def walk(node):
+            for child in node.children.values():
+                calls, self_s, rows = flat.get(child.name, (0, 0.0, 0))
+                flat[child.name] = (calls + child.calls,
+                                    self_s + child.total_s - child.child_s,
+                                    rows + child.rows)
+                walk(child)
+
+        walk(self.root)
+        ordered = sorted(flat.items(), key=lambda kv: -kv[1][1])[:limit]
+        lines = [f"{'stage':32} {'calls':>9} {'self s':>10} {'rows':>10}"]
+        for name, (calls, self_s, rows) in ordered:
+            lines.append(f"{name:32} {calls:9d} {self_s:10.4f} {rows:10d}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profiled(module=None, track_allocations=False):
+    """Enable a fresh Profiler for the duration of the block."""
+    prof = Profiler(track_allocations=track_allocations)
+    prof.enable(module)
+    try:
+        yield prof
+    finally:
+        prof.disable()
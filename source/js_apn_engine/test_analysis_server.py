@@ -0,0 +1,145 @@
+# test_analysis_server.py
+# Run with: python -m pytest -q
+
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from analysis_server import AnalysisService, Handler, LRUCache, parse_params
+
+PLAIN_BOB_MINOR = {"pn": "x16x16x16,12", "stage": "6"}
+
+
+@pytest.fixture(scope="module")
+def service():
+    svc = AnalysisService(workers=1, cache_size=4)
+    yield svc
+    svc.shutdown()
+
+
+@pytest.fixture(scope="module")
+def base_url(service):
+    handler = type("BoundHandler", (Handler,), {"service": service})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(url, body=None, headers=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1      # a is now the most recent
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1}
+
+
+def test_parse_params_defaults_to_back_two_bells():
+    assert parse_params({}, 6)["pair"] == (5, 6)
+    assert parse_params({"pair": "9,0"}, 10)["pair"] == (9, 10)
+    with pytest.raises(ValueError):
+        parse_params({"pair": "7,8"}, 6)
+    with pytest.raises(ValueError):
+        parse_params({"pair": "1,2,3"}, 6)
+
+
+def test_repeat_query_is_served_from_cache(service):
+    q = dict(PLAIN_BOB_MINOR, pair="2,3")
+    before = service.results.stats()
+    first = service.query("metrics", q)
+    second = service.query("metrics", dict(q))
+    after = service.results.stats()
+    assert first == second
+    assert json.loads(first[1])["pair"] == [2, 3]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_identical_concurrent_queries_submit_once(service):
+    q = dict(PLAIN_BOB_MINOR, pair="3,4", wraparounds="1")
+    submitted = []
+    real_submit = service.pool.submit
+
+    def counting_submit(*args, **kwargs):
+        submitted.append(args[1])
+        return real_submit(*args, **kwargs)
+
+    service.pool.submit = counting_submit
+    try:
+        start = threading.Barrier(8)
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(service.query("metrics", q))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        del service.pool.submit
+    assert submitted == ["metrics"]
+    assert len(results) == 8 and len(set(results)) == 1
+    assert service.stats()["inflight"] == 0
+
+
+def test_query_errors(service):
+    with pytest.raises(ValueError):
+        service.query("metrics", {"pn": "x16x16x16,12"})            # no stage
+    with pytest.raises(ValueError):
+        service.query("metrics", {"rows": ["123456", "12345"]})
+    with pytest.raises(ValueError):
+        service.query("metrics", {"rows": [[1, 2, 3], [2, 1, 3]]})
+    with pytest.raises(ValueError):
+        service.query("nonsense", PLAIN_BOB_MINOR)
+
+
+def test_http_status_codes(base_url):
+    status, body = request(base_url + "/metrics?pn=x16x16x16,12&stage=6")
+    assert status == 200 and json.loads(body)["pair"] == [5, 6]
+
+    status, body = request(base_url + "/rank", {"rows": [[1, 2, 3], [2, 1, 3]]})
+    assert status == 400 and "error" in json.loads(body)
+
+    status, body = request(base_url + "/rank", {"rows": ["123456", "214365"], "top": 1})
+    assert status == 200 and len(json.loads(body)) == 1
+
+    status, _ = request(base_url + "/metrics?pn=x16x16x16,12&stage=6&pair=7,8")
+    assert status == 400
+    status, _ = request(base_url + "/nowhere")
+    assert status == 404
+
+    status, body = request(base_url + "/heatmap?pn=x16x16x16,12&stage=6&title=%3Cb%3E")
+    assert status == 200 and b"<b>" not in body and b"&lt;b&gt;" in body
+
+    conn = http.client.HTTPConnection(base_url.split("//")[1], timeout=30)
+    conn.putrequest("POST", "/rank")
+    conn.putheader("Content-Length", "abc")
+    conn.endheaders()
+    assert conn.getresponse().status == 400
+    conn.close()
+
+    status, body = request(base_url + "/stats")
+    assert status == 200 and "results" in json.loads(body)
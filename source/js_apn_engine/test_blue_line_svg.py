@@ -0,0 +1,35 @@
+# test_blue_line_svg.py
+# Run with: python -m pytest -q
+
+import xml.etree.ElementTree as ET
+
+from blue_line_svg import bell_path, write_blue_line_svg
+from place_notation import generate_rows
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def test_bell_path_merges_runs():
+    rows = ["1234", "2143", "2413", "4231", "4321"]
+    # bell 1 hunts up from lead to 4ths: one segment of 3 blows right, then a place
+    assert bell_path(rows, "1", 0, 0, 10, 20) == "M5 10l30 60l0 20"
+    assert bell_path(rows, "5", 0, 0, 10, 20) == ""
+
+
+def test_svg_is_well_formed_with_odd_row_text(tmp_path):
+    path = write_blue_line_svg(["1<&4", "2143"], str(tmp_path / "odd.svg"))
+    root = ET.parse(path).getroot()
+    assert [t.text for t in root.iter(SVG + "text")] == ["1<&4", "2143"]
+
+
+def test_columns_and_separators(tmp_path):
+    rows = generate_rows("x16x16x16,12", 6)    # 61 rows, 5 leads of 12
+    path = write_blue_line_svg(rows, str(tmp_path / "pb.svg"), lead_length=12, rows_per_column=24,
+                               separator_color="#fff")
+    root = ET.parse(path).getroot()
+    columns = [g for g in root.iter(SVG + "g") if "data-column" in g.attrib]
+    assert len(columns) == 3
+    lines = list(root.iter(SVG + "line"))
+    assert len(lines) == 5
+    assert all(line.get("stroke") == "#fff" for line in lines)
+    assert {p.get("data-bell") for p in root.iter(SVG + "path")} == {"1", "2"}
@@ -0,0 +1,133 @@
+# test_cycle_analysis.py
+# Run with: python -m pytest -q
+
+import math
+
+import numpy as np
+import pytest
+
+from cycle_analysis import (
+    coursing_orders, cycle_lengths, cycle_profile, cycle_types, match_types, parse_type, periods, type_label,
+)
+from permutation import rows_array
+from place_notation import STAGE_SYMBOLS, course_rows
+
+BRISTOL_MAJOR = "x58x14.58x58.36.14x14.58x14x18,18"
+STEDMAN_TRIPLES = "3.1.7.3.1.3,1"
+
+
+def walk_cycles(row):
+    """Cycle lengths of a row, one cycle at a time (the bell from place i moves to its place in row)."""
+    to = [row.index(STAGE_SYMBOLS[i]) for i in range(len(row))]
+    seen = [False] * len(row)
+    lengths = []
+    for start in range(len(row)):
+        n = 0
+        i = start
+        while not seen[i]:
+            seen[i] = True
+            i = to[i]
+            n += 1
+        if n:
+            lengths.append(n)
+    return sorted(lengths, reverse=True)
+
+
+def walk_label(lengths, ignore_fixed=True):
+    parts = [str(k) for k in lengths if k > 1 or not ignore_fixed]
+    return ".".join(parts) or ("1" if ignore_fixed else "")
+
+
+def test_rows_array():
+    arr = rows_array(["1234567890ET", "2143658709te"])
+    assert arr.dtype == np.uint8
+    assert arr.tolist() == [list(range(1, 13)), [2, 1, 4, 3, 6, 5, 8, 7, 10, 9, 12, 11]]
+
+
+@pytest.mark.parametrize("rows", [
+    ["1234567E", "12345678"],    # a bell from a higher stage
+    ["12345677"],                # a repeated bell
+    ["12345678", "1234567"],     # ragged
+    ["1234567?"],
+    ["1234567\u00e9"],
+])
+def test_rows_array_rejects_bad_rows(rows):
+    with pytest.raises(ValueError):
+        rows_array(rows)
+    with pytest.raises(ValueError):
+        cycle_profile(rows)
+
+
+def test_cycles_match_per_row_walk():
+    for pn, stage in [(BRISTOL_MAJOR, 8), ("x30x14x12.50.16x34x10x16x70.16x16.70.16x16.70x16x10x34x16.50.12x14x30x10", 10)]:
+        rows = course_rows(pn, stage)
+        lengths = cycle_lengths(rows_array(rows))
+        counts = cycle_types(lengths)
+        per = periods(lengths)
+        for i, row in enumerate(rows):
+            cycles = walk_cycles(row)
+            assert sorted(lengths[i].tolist()) == sorted(k for k in cycles for _ in range(k))
+            assert type_label(counts[i]) == walk_label(cycles)
+            assert type_label(counts[i], ignore_fixed=False) == walk_label(cycles, ignore_fixed=False)
+            assert per[i] == math.lcm(*cycles)
+
+
+def test_known_cycle_types():
+    lengths = cycle_lengths(rows_array(["12345678", "21436587", "23456781", "13527486"]))
+    counts = cycle_types(lengths)
+    assert [type_label(c) for c in counts] == ["1", "2.2.2.2", "8", "7"]
+    assert periods(lengths).tolist() == [1, 2, 8, 7]
+    assert match_types(counts, "7").tolist() == [False, False, False, True]
+    assert match_types(counts, (2, 2, 2, 2)).tolist() == [False, True, False, False]
+    assert match_types(counts, "7.1", ignore_fixed=False).tolist() == [False, False, False, True]
+
+
+def test_parse_type_validation():
+    assert parse_type("5.3", 8)[[3, 5]].tolist() == [1, 1]
+    # explicit fixed bells and the implied ones come to the same thing
+    assert parse_type([4, 3, 1], 8, ignore_fixed=False).tolist() == parse_type("4.3", 8, ignore_fixed=False).tolist()
+    assert parse_type([4, 3, 1], 8)[1] == 0
+    for bad in ["9", "5.0", "5.4", (0,), (-1,)]:
+        with pytest.raises(ValueError):
+            parse_type(bad, 8)
+        with pytest.raises(ValueError):
+            parse_type(bad, 8, ignore_fixed=False)
+    with pytest.raises(ValueError):
+        cycle_profile(course_rows(BRISTOL_MAJOR, 8), targets=["9"])
+
+
+def as_strings(orders):
+    return ["".join(STAGE_SYMBOLS[b - 1] for b in r) for r in orders]
+
+
+def test_coursing_orders():
+    # rounds and the plain lead heads of an 8ths place method keep the plain coursing order
+    arr = rows_array(["12345678", "13527486", "15738264"])
+    assert as_strings(coursing_orders(arr)) == ["8753246"] * 3
+    # the lead head after a bob in Plain Bob Major
+    assert as_strings(coursing_orders(rows_array(["12357486"]))) == ["8732546"]
+    # Royal, and a hunt other than the treble
+    assert as_strings(coursing_orders(rows_array(["1234567890"]))) == ["097532468"]
+    assert as_strings(coursing_orders(rows_array(["12345678"]), hunt=8)) == ["7531246"]
+
+
+def test_cycle_profile():
+    rows = course_rows(BRISTOL_MAJOR, 8)
+    prof = cycle_profile(rows, lead_length=32, targets=["7", "5.3"])
+    assert len(prof["row_type"]) == len(rows)
+    assert sum(prof["type_counts"].values()) == len(rows)
+    for i, row in enumerate(rows):
+        assert prof["labels"][prof["row_type"][i]] == walk_label(walk_cycles(row))
+    assert prof["lead_heads"].tolist() == list(range(0, 224, 32))
+    assert prof["coursing_orders"] == ["8753246"] * 7
+    sevens = [i for i, row in enumerate(rows) if walk_cycles(row)[0] == 7]
+    assert prof["flagged_rows"]["7"].tolist() == sevens
+    # the plain lead heads of an 8ths place method are all 7-cycles apart from rounds
+    assert prof["flagged_leads"]["7"].tolist() == list(range(1, 7))
+
+
+def test_periods_odd_stage():
+    rows = course_rows(STEDMAN_TRIPLES, 7)
+    lengths = cycle_lengths(rows_array(rows))
+    for i, row in enumerate(rows):
+        assert periods(lengths[i:i + 1])[0] == math.lcm(*walk_cycles(row))
@@ -0,0 +1,119 @@
+# test_extent.py
+# Run with: python -m pytest -q
+
+import math
+from collections import Counter
+from itertools import permutations
+
+import pytest
+
+from extent import (
+    extent_array, extent_pattern_counts, extent_rank_all_pairs, extent_tenor_metrics, pattern_counts, rank_of,
+    row_at,
+)
+from place_notation import STAGE_SYMBOLS
+from tenors_dist_chart import count_patterns, rank_all_pairs, tenor_metrics
+
+
+@pytest.fixture(autouse=True)
+def cache_in_tmp(tmp_path, monkeypatch):
+    monkeypatch.setenv("TINY_TOWER_CACHE", str(tmp_path))
+
+
+def extent_rows(stage):
+    return ["".join(p) for p in permutations(STAGE_SYMBOLS[:stage])]
+
+
+def assert_same_summary(got, want):
+    assert tuple(got["pair"]) == tuple(want["pair"])
+    for k, v in want.items():
+        if k == "pair":
+            continue
+        if k == "distribution_pct":
+            assert got[k] == pytest.approx(v)
+        else:
+            assert got[k] == pytest.approx(v), k
+
+
+def window_counts(rows, width, include_wraparounds=False):
+    """count_patterns without its front-six filter: windows within rows, or across odd+even rows."""
+    counts = Counter()
+    for i, row in enumerate(rows):
+        if include_wraparounds and i % 2:
+            if i + 1 >= len(rows):
+                continue
+            row = row + rows[i + 1]
+        for s in range(len(row) - width + 1):
+            counts[row[s:s + width]] += 1
+    return sorted(((c, p) for p, c in counts.items()), key=lambda t: (-t[0], t[1]))
+
+
+def test_extent_array_is_lexicographic():
+    for stage in range(1, 7):
+        arr = extent_array(stage)
+        assert len(arr) == math.factorial(stage)
+        assert ["".join(STAGE_SYMBOLS[b - 1] for b in r) for r in arr] == extent_rows(stage)
+
+
+def test_rank_of_and_row_at():
+    rows = extent_rows(5)
+    for rank in (0, 1, 17, 63, 119):
+        assert row_at(rank, 5) == rows[rank]
+        assert rank_of(rows[rank]) == rank
+
+
+@pytest.mark.parametrize("stage", [5, 6])
+@pytest.mark.parametrize("wrap", [False, True])
+def test_rank_all_pairs_matches_list_version(stage, wrap):
+    rows = extent_rows(stage)
+    want = {s["pair"]: s for s in rank_all_pairs(rows, include_wraparounds=wrap)}
+    got = extent_rank_all_pairs(stage, include_wraparounds=wrap)
+    assert {tuple(s["pair"]) for s in got} == set(want)
+    for s in got:
+        assert_same_summary(s, want[tuple(s["pair"])])
+    # read back from the disk cache, in the same order
+    assert [s["pair"] for s in extent_rank_all_pairs(stage, include_wraparounds=wrap)] == [s["pair"] for s in got]
+
+
+def test_rank_all_pairs_ties_break_by_pair():
+    got = extent_rank_all_pairs(6)
+    # every pair is equivalent over the extent without wraparounds, so the ranking is by pair
+    assert [s["pair"] for s in got] == sorted(s["pair"] for s in got)
+
+
+@pytest.mark.parametrize("stage", [5, 6])
+@pytest.mark.parametrize("wrap", [False, True])
+def test_tenor_metrics_matches_list_version(stage, wrap):
+    rows = extent_rows(stage)
+    assert_same_summary(extent_tenor_metrics(stage, include_wraparounds=wrap),
+                        tenor_metrics(rows, (stage - 1, stage), include_wraparounds=wrap))
+    assert_same_summary(extent_tenor_metrics(stage, (2, 4), include_wraparounds=wrap),
+                        tenor_metrics(rows, (2, 4), include_wraparounds=wrap))
+
+
+def test_tenor_metrics_rejects_bells_outside_stage():
+    with pytest.raises(ValueError):
+        extent_tenor_metrics(6, (7, 8))
+
+
+@pytest.mark.parametrize("wrap", [False, True])
+def test_pattern_counts_matches_count_patterns(wrap):
+    # count_patterns only keeps rows whose front six are 1-6, i.e. every row on six bells
+    rows = extent_rows(6)
+    assert pattern_counts(extent_array(6), 6, include_wraparounds=wrap) == count_patterns(rows, 6, wrap)
+    assert extent_pattern_counts(6, 6, include_wraparounds=wrap) == count_patterns(rows, 6, wrap)
+
+
+@pytest.mark.parametrize("stage, width", [(5, 2), (5, 3), (5, 5), (5, 7), (6, 4), (6, 9)])
+@pytest.mark.parametrize("wrap", [False, True])
+def test_pattern_counts_matches_window_scan(stage, width, wrap):
+    got = pattern_counts(extent_array(stage), width, include_wraparounds=wrap)
+    assert got == window_counts(extent_rows(stage), width, wrap)
+    if width > stage:
+        assert bool(got) == wrap
+
+
+def test_pattern_counts_front_only():
+    rows = extent_rows(5)
+    got = pattern_counts(extent_array(5), 3, front_only=True)
+    assert got == window_counts([r[:3] for r in rows], 3)
@@ -0,0 +1,132 @@
+# test_falseness.py
+# Run with: python -m pytest -q
+
+import random
+
+import pytest
+
+from falseness import TruthChecker, false_course_heads, false_lead_heads, is_true_touch, touch_lead_heads
+from permutation import inverse, transpose
+from place_notation import course_rows, lead_rows
+
+PLAIN_BOB_MINOR = ("x16x16x16,12", 6, ["14", "1234"])
+PLAIN_BOB_MAJOR = ("x18x18x18x18,12", 8, ["14", "1234"])
+CAMBRIDGE_MAJOR = ("x38x14x1258x36x14x58x16x78,12", 8, ["14", "1234"])
+BRISTOL_MAJOR = ("x58x14.58x58.36.14x14.58x14x18,18", 8, ["14", "1234"])
+
+
+def touch_rows(pn, stage, heads):
+    """Every row of a touch, written out lead by lead from its lead heads."""
+    lead = lead_rows(pn, stage)[:-1]
+    return [transpose(h, r) for h in heads for r in lead]
+
+
+def is_true_by_rows(pn, stage, heads):
+    rows = touch_rows(pn, stage, heads)
+    return len(set(rows)) == len(rows)
+
+
+def test_transpose_inverse():
+    for r in course_rows("x16x16x16,12", 6):
+        assert transpose(r, inverse(r)) == transpose(inverse(r), r) == "123456"
+
+
+def test_touch_lead_heads_plain_course():
+    heads = touch_lead_heads("x16x16x16,12", 6, ["p"] * 5)
+    assert heads == ["123456", "135264", "156342", "164523", "142635"]
+    lead = lead_rows("x16x16x16,12", 6)[:-1]
+    assert touch_rows("x16x16x16,12", 6, heads) == course_rows("x16x16x16,12", 6)
+    assert len(lead) * 5 == len(course_rows("x16x16x16,12", 6))
+
+
+@pytest.mark.parametrize("method", [PLAIN_BOB_MINOR, PLAIN_BOB_MAJOR, CAMBRIDGE_MAJOR, BRISTOL_MAJOR])
+def test_is_true_touch_matches_brute_force(method):
+    pn, stage, calls = method
+    flh = false_lead_heads(pn, stage)
+    rnd = random.Random(pn)
+    seen = set()
+    for _ in range(60):
+        n_leads = rnd.randint(2, 24)
+        lead_ends = [rnd.choice(["p", "p"] + calls) for _ in range(n_leads)]
+        heads = touch_lead_heads(pn, stage, lead_ends)
+        expected = is_true_by_rows(pn, stage, heads)
+        assert is_true_touch(heads, flh) == expected, lead_ends
+        seen.add(expected)
+    assert seen == {True, False}   # the sample covered both outcomes
+
+
+def test_false_course_heads():
+    pn, stage = "x16x16x16,12", 6
+    fch = false_course_heads(pn, stage)
+    assert "123456" not in fch
+    # the plain course is true on its own, and false against itself
+    assert is_true_touch(["123456"], fch)
+    assert not is_true_touch(["123456", "123456"], fch)
+    # courses starting from heads in the false set clash with the plain course
+    for head in list(fch)[:20]:
+        assert not is_true_touch(["123456", head], fch)
+
+
+def test_truth_checker_backtracking():
+    pn, stage, calls = PLAIN_BOB_MAJOR
+    flh = false_lead_heads(pn, stage)
+    heads = touch_lead_heads(pn, stage, ["p"] * 7)
+
+    checker = TruthChecker(flh)
+    for h in heads:
+        assert checker.add(h)
+    assert checker.heads == heads
+    # ringing the plain course again is false against every lead of it
+    assert not checker.add(heads[3])
+    assert checker.heads == heads
+
+    checker.remove()
+    assert checker.heads == heads[:-1]
+    assert checker.add(heads[-1])
+
+    # remove by value, out of order, then every head is free again
+    checker.remove(heads[2])
+    assert heads[2] not in checker.heads
+    assert checker.add(heads[2])
+    for h in list(checker.heads):
+        checker.remove(h)
+    assert checker.heads == []
+    assert checker._blocked == {}
+    assert all(not checker.is_blocked(h) for h in heads)
+
+
+def test_truth_checker_search_agrees_with_brute_force():
+    """A depth-first search that backtracks with remove() finds only true touches."""
+    pn, stage, calls = PLAIN_BOB_MINOR
+    flh = false_lead_heads(pn, stage)
+    checker = TruthChecker(flh)
+    found = []
+
+    def search(lead_ends, head):
+        if len(lead_ends) == 6:
+            found.append(list(lead_ends))
+            return
+        if not checker.add(head):
+            return
+        for le in ["p"] + calls:
+            lead_ends.append(le)
+            search(lead_ends, touch_lead_heads(pn, stage, lead_ends + ["p"])[-1])
+            lead_ends.pop()
+        checker.remove()
+
+    search([], "123456")
+    assert found
+    assert checker.heads == []
+    for lead_ends in found:
+        heads = touch_lead_heads(pn, stage, lead_ends)
+        assert is_true_by_rows(pn, stage, heads)
+
+
+def test_internally_false_method():
+    # x.x.x repeats rounds within the lead
+    flh = false_lead_heads("x.x.x", 4)
+    assert "1234" in flh
+    checker = TruthChecker(flh)
+    assert checker.internally_false
+    assert not checker.add("1234")
+    assert not is_true_touch(["1234"], flh)
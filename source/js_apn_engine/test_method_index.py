@@ -0,0 +1,100 @@
+# test_method_index.py
+# Run with: python -m pytest -q
+
+import numpy as np
+import pytest
+
+from method_index import MethodIndex, method_vector, vector_length
+from place_notation import course_rows
+
+MINOR = {
+    "Plain Bob": "x16x16x16,12",
+    "Cambridge": "x36x14x12x36x14x56,12",
+    "Kent": "34x34.16x12x16x12x16,16",
+    "Double Oxford": "x16x14x36x12x16,12",
+    "St Clements": "x36x36x36,12",
+}
+
+
+def random_index(n, capacity=256, seed=0):
+    idx = MethodIndex(6, capacity=capacity)
+    rnd = np.random.default_rng(seed)
+    for i in range(n):
+        idx.add_vector(f"m{i}", rnd.random(idx.dim, dtype=np.float32))
+    return idx
+
+
+def test_method_vector_length():
+    rows = course_rows(MINOR["Plain Bob"], 6)
+    assert method_vector(rows).shape == (vector_length(6),)
+
+
+def test_grows_from_zero_capacity():
+    idx = random_index(5, capacity=0)
+    assert len(idx) == 5
+    assert idx.vectors.shape == (5, idx.dim)
+
+
+def test_re_adding_a_name_replaces_it():
+    idx = random_index(3)
+    vec = np.ones(idx.dim, dtype=np.float32)
+    idx.add_vector("m1", vec)
+    assert len(idx) == 3
+    assert idx.nearest(vec, k=1) == [("m1", 0.0)]
+
+
+def test_nearest_many_matches_brute_force():
+    idx = random_index(300, capacity=7)
+    queries = np.random.default_rng(1).random((20, idx.dim), dtype=np.float32)
+    for k in (1, 5, 300, 400):
+        got = idx.nearest_many(queries, k=k)
+        for q, hits in zip(queries, got):
+            d = np.linalg.norm(idx.vectors.astype(np.float64) - q, axis=1)
+            want = np.sort(d)[:min(k, len(idx))]
+            # same distances in the same order (names can swap on float32 near-ties)
+            assert len(hits) == len(want)
+            assert [dist for _, dist in hits] == pytest.approx(want, rel=1e-4, abs=1e-4)
+            assert [dist for _, dist in hits] == sorted(dist for _, dist in hits)
+            assert len({name for name, _ in hits}) == len(hits)
+            for name, dist in hits:
+                assert d[idx.names.index(name)] == pytest.approx(dist, rel=1e-4, abs=1e-4)
+
+
+def test_empty_index():
+    idx = MethodIndex(6)
+    assert idx.nearest_many(np.zeros((2, idx.dim)), k=3) == [[], []]
+
+
+def test_methods_and_like():
+    idx = MethodIndex(6)
+    for name, pn in MINOR.items():
+        idx.add_pn(name, pn)
+    assert idx.nearest_pn(MINOR["Cambridge"], k=1)[0] == ("Cambridge", pytest.approx(0.0, abs=1e-3))
+
+    like = idx.like("Cambridge", k=10)
+    assert "Cambridge" not in [name for name, _ in like]
+    assert sorted(name for name, _ in like) == sorted(n for n in MINOR if n != "Cambridge")
+    assert len(idx.like("Cambridge", k=2)) == 2
+
+    with pytest.raises(ValueError):
+        idx.add("Bristol", course_rows("x58x14.58x58.36.14x14.58x14x18,18", 8))
+
+
+def test_save_load_round_trip(tmp_path):
+    idx = MethodIndex(6, exclude={1, 2}, include_wraparounds=True)
+    for name, pn in MINOR.items():
+        idx.add_pn(name, pn)
+    path = idx.save(str(tmp_path / "minor.npz"))
+
+    back = MethodIndex.load(path)
+    assert back.stage == 6
+    assert back.exclude == frozenset({1, 2})
+    assert back.include_wraparounds is True
+    assert back.names == idx.names
+    np.testing.assert_array_equal(back.vectors, idx.vectors)
+    assert [n for n, _ in back.like("Kent", k=4)] == [n for n, _ in idx.like("Kent", k=4)]
+    assert [d for _, d in back.like("Kent", k=4)] == pytest.approx([d for _, d in idx.like("Kent", k=4)], abs=1e-4)
+
+    # a loaded index can still grow
+    back.add_pn("Plain Bob again", MINOR["Plain Bob"])
+    assert back.like("Plain Bob", k=1)[0][0] == "Plain Bob again"
@@ -0,0 +1,96 @@
+# test_place_notation.py
+# Run with: python -m pytest -q
+
+import pytest
+
+from place_notation import (
+    apply_token, course_rows, expand_place_notation, generate_rows, lead_rows, symbol_to_bell,
+)
+
+ED_ROYAL_PN = "x30x14x12.50.16x34x10x16x70.16x16.70.16x16.70x16x10x34x16.50.12x14x30x10"
+
+# The plain course tenors_dist_chart.py used to carry as a literal list.
+ED_ROYAL_COURSE = [
+    "1234567890", "2143658709", "1246385079", "2164830597", "2614385079", "6241830597", "6214385079", "2641358709",
+    "2463157890", "4236518709", "2436157890", "4263518709", "4625381079", "6452830197", "6548231079", "5684320197",
+    "6548230917", "6452839071", "4625380917", "4263589071", "2436859701", "2348657910", "3284569701", "3825467910",
+    "8352647190", "3825461709", "3284567190", "2348651709", "2436815079", "4263180597", "2463815079", "4236180597",
+    "4321685079", "3412658709", "3421567890", "4312658709", "4132567890", "1423658709", "4126385079", "1462830597",
+    "1648203957", "6184029375", "1680492735", "6108947253", "6018492735", "0681947253", "0618492735", "6081429375",
+    "6804123957", "8640219375", "6840123957", "8604219375", "8062491735", "0826947153", "0289641735", "2098467153",
+    "0289647513", "0826945731", "8062497513", "8604295731", "6840925371", "6489023517", "4698205371", "4962803517",
+    "9426083157", "4962801375", "4698203157", "6489021375", "6840912735", "8604197253", "6804912735", "8640197253",
+    "8461092735", "4816029375", "4861203957", "8416029375", "8146203957", "1864029375", "8160492735", "1806947253",
+    "1089674523", "0198765432", "1097856342", "0179583624", "0719856342", "7091583624", "7019856342", "0791865432",
+    "0978164523", "9087615432", "0987164523", "9078615432", "9706851342", "7960583124", "7695081342", "6759803124",
+    "7695083214", "7960582341", "9706853214", "9078652341", "0987562431", "0895764213", "8059672431", "8506974213",
+    "5860794123", "8506971432", "8059674123", "0895761432", "0987516342", "9078153624", "0978516342", "9087153624",
+    "9801756342", "8910765432", "8901674523", "9810765432", "9180674523", "1908765432", "9107856342", "1970583624",
+    "1795038264", "7159302846", "1753920486", "7135294068", "7315920486", "3751294068", "3715920486", "7351902846",
+    "7539108264", "5793012846", "7593108264", "5739012846", "5370921486", "3507294168", "3052791486", "0325974168",
+    "3052794618", "3507296481", "5370924618", "5739026481", "7593206841", "7952308614", "9725036841", "9270538614",
+    "2907358164", "9270531846", "9725038164", "7952301846", "7593210486", "5739124068", "7539210486", "5793124068",
+    "5971320486", "9517302846", "9571038264", "5917302846", "5197038264", "1579302846", "5173920486", "1537294068",
+    "1352749608", "3125476980", "1324567890", "3142658709", "3412567890", "4321658709", "4312567890", "3421576980",
+    "3245179608", "2354716980", "3254179608", "2345716980", "2437561890", "4273658109", "4726351890", "7462538109",
+    "4726358019", "4273650891", "2437568019", "2345760891", "3254670981", "3526479018", "5362740981", "5637249018",
+    "6573429108", "5637241980", "5362749108", "3526471980", "3254617890", "2345168709", "3245617890", "2354168709",
+    "2531467890", "5213476980", "5231749608", "2513476980", "2153749608", "1235476980", "2134567890", "1243658709",
+    "1426385079", "4162830597", "1468203957", "4186029375", "4816203957", "8461029375", "8416203957", "4861230597",
+    "4682135079", "6428310597", "4628135079", "6482310597", "6843201957", "8634029175", "8360421957", "3806249175",
+    "8360429715", "8634027951", "6843209715", "6482307951", "4628037591", "4260835719", "2406387591", "2043685719",
+    "0234865179", "2043681597", "2406385179", "4260831597", "4628013957", "6482109375", "4682013957", "6428109375",
+    "6241803957", "2614830597", "2641385079", "6214830597", "6124385079", "1642830597", "6148203957", "1684029375",
+    "1860492735", "8106947253", "1809674523", "8190765432", "8910674523", "9801765432", "9810674523", "8901647253",
+    "8096142735", "0869417253", "8069142735", "0896417253", "0984671523", "9048765132", "9407861523", "4970685132",
+    "9407865312", "9048763521", "0984675312", "0896473521", "8069743251", "8607942315", "6870493251", "6784092315",
+    "7648902135", "6784091253", "6870492135", "8607941253", "8069714523", "0896175432", "8096714523", "0869175432",
+    "0681974523", "6018947253", "6081492735", "0618947253", "0168492735", "1086947253", "0189674523", "1098765432",
+    "1907856342", "9170583624", "1975038264", "9157302846", "9517038264", "5971302846", "5917038264", "9571083624",
+    "9750186342", "7905813624", "9705186342", "7950813624", "7598031264", "5789302146", "5873901264", "8537092146",
+    "5873902416", "5789304261", "7598032416", "7950834261", "9705384621", "9073586412", "0937854621", "0398756412",
+    "3089576142", "0398751624", "0937856142", "9073581624", "9705318264", "7950132846", "9750318264", "7905132846",
+    "7091538264", "0719583624", "0791856342", "7019583624", "7109856342", "1790583624", "7195038264", "1759302846",
+    "1573920486", "5137294068", "1532749608", "5123476980", "5213749608", "2531476980", "2513749608", "5231794068",
+    "5327190486", "3572914068", "5372190486", "3527914068", "3259741608", "2395476180", "2934571608", "9243756180",
+    "2934576810", "2395478601", "3259746810", "3527948601", "5372498061", "5734290816", "7543928061", "7459320816",
+    "4795230186", "7459321068", "7543920186", "5734291068", "5372419608", "3527146980", "5327419608", "3572146980",
+    "3751249608", "7315294068", "7351920486", "3715294068", "3175920486", "1357294068", "3152749608", "1325476980",
+]
+
+
+def test_symbol_to_bell():
+    assert symbol_to_bell("1") == 1
+    assert symbol_to_bell("0") == 10
+    assert symbol_to_bell("E") == symbol_to_bell("e") == 11
+    assert symbol_to_bell("t") == 12
+    with pytest.raises(ValueError):
+        symbol_to_bell("I")
+
+
+def test_comma_pn_is_palindromic():
+    assert expand_place_notation("x16x16x16,12") == ["x", "16", "x", "16", "x", "16", "x", "16", "x", "16", "x", "12"]
+
+
+def test_implicit_places():
+    assert apply_token("123456", "x") == "214365"
+    assert apply_token("12345", "1") == "13254"
+    assert apply_token("1234567", "3") == "2135476"
+
+
+def test_plain_bob_minor_lead():
+    rows = lead_rows("x16x16x16,12", 6)
+    assert rows[0] == "123456"
+    assert rows[-1] == "135264"
+    assert len(rows) == 13
+
+
+def test_generate_rows_includes_closing_rounds():
+    rows = generate_rows("x16x16x16,12", 6)
+    assert len(rows) == 61
+    assert rows[0] == rows[-1] == "123456"
+    assert course_rows("x16x16x16,12", 6) == rows[:-1]
+
+
+def test_ed_royal_course():
+    assert course_rows(ED_ROYAL_PN, 10) == ED_ROYAL_COURSE
@@ -0,0 +1,96 @@
+# test_tenors_profile.py
+# Run with: python -m pytest -q
+
+import types
+
+import pytest
+
+import tenors_dist_chart as tdc
+import tenors_profile
+from place_notation import course_rows
+from tenors_profile import HOT_FUNCTIONS, Profiler, profiled
+
+ROWS = course_rows("x16x16x16,12", 6)   # 60 rows
+
+
+def originals():
+    return {name: getattr(tdc, name) for name in HOT_FUNCTIONS if hasattr(tdc, name)}
+
+
+def test_profiled_restores_functions():
+    before = originals()
+    with profiled():
+        assert tdc.rank_all_pairs is not before["rank_all_pairs"]
+        assert tdc.rank_all_pairs.__wrapped__ is before["rank_all_pairs"]
+    assert originals() == before
+    assert tenors_profile._active is None
+
+
+def test_profiled_restores_functions_on_error():
+    before = originals()
+    with pytest.raises(ValueError):
+        with profiled():
+            tdc.rank_all_pairs([])
+    assert originals() == before
+    assert tenors_profile._active is None
+
+
+def test_enable_failure_leaves_module_unpatched():
+    def f(rows):
+        return rows
+
+    class ReadOnlyG(types.ModuleType):
+        def __setattr__(self, name, value):
+            if name == "g" and "g" in self.__dict__:
+                raise AttributeError("g is read-only")
+            super().__setattr__(name, value)
+
+    mod = ReadOnlyG("fake")
+    mod.f = f
+    mod.g = f
+    prof = Profiler()
+    with pytest.raises(AttributeError):
+        prof.enable(mod, names=("f", "g"))
+    assert mod.f is f and mod.g is f
+    assert tenors_profile._active is None
+    # and a fresh profiler can still be enabled
+    with profiled():
+        pass
+
+
+def test_nested_call_tree():
+    with profiled() as prof:
+        tdc.rank_all_pairs(ROWS)
+
+    stages = {s["name"]: s for s in prof.to_dict()["stages"]}
+    rank = stages["rank_all_pairs"]
+    assert rank["calls"] == 1
+    assert rank["rows"] == 60
+    children = {c["name"]: c for c in rank["children"]}
+    dist = children["_distances_for_pair"]
+    assert dist["calls"] == 10         # pairs of bells 2-6
+    assert dist["rows"] == 10 * 60
+    assert children["_mean"]["calls"] >= 10
+    assert rank["self_s"] <= rank["total_s"]
+    assert dist["total_s"] <= rank["total_s"]
+
+
+def test_collapsed_lines_parse(tmp_path):
+    with profiled() as prof:
+        tdc.rank_all_pairs(ROWS)
+        tdc.tenor_metrics(ROWS, (5, 6))
+
+    lines = prof.collapsed_lines()
+    assert lines
+    stacks = {}
+    for line in lines:
+        stack, us = line.rsplit(" ", 1)
+        assert int(us) > 0
+        stacks[stack] = int(us)
+        assert all(frame in HOT_FUNCTIONS for frame in stack.split(";"))
+    assert any(s.startswith("rank_all_pairs;_distances_for_pair") for s in stacks)
+
+    path = prof.write_collapsed(str(tmp_path / "p.folded"))
+    with open(path, encoding="utf-8") as f:
+        assert f.read().splitlines() == lines
+    assert "rank_all_pairs" in prof.summary()